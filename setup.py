@@ -9,6 +9,8 @@ setup(
     packages=find_packages(),
     install_requires=[
         "beautifulsoup4>=4.9.3",
+        "selectolax>=0.3.17",
+        "lxml>=4.9.0",
         "requests>=2.25.1",
         "pandas>=1.2.0",
         "scikit-learn>=0.24.0",
@@ -17,9 +19,13 @@ setup(
         "python-dotenv>=0.19.0",
         "loguru>=0.5.3",
         "aiohttp>=3.8.0",
+        "aiohttp-retry>=2.8.0",
+        "aiolimiter>=1.1.0",
         "asyncio>=3.4.3",
         "numpy>=1.19.0",
+        "orjson>=3.8.0",
+        "uvloop>=0.17.0; sys_platform != 'win32'",
         "playwright>=1.49.0"
     ],
-    python_requires=">=3.8",
+    python_requires=">=3.9",
 ) 
\ No newline at end of file
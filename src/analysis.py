@@ -1,20 +1,27 @@
 """
 Script to analyze and visualize the scraped job listings data.
 """
-import json
+import hashlib
 from pathlib import Path
 from typing import Dict, List
 
 import matplotlib.pyplot as plt
 import numpy as np
+import orjson
 import pandas as pd
 import seaborn as sns
 from loguru import logger
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
 
 from src.config.config import OUTPUT_DIR
 
+# Configure the plot style once at import rather than on every plot
+plt.style.use('seaborn-v0_8')
+
+CACHE_DIR = Path("cache")
+
 
 def load_data() -> Dict[str, List[Dict]]:
     """Load scraped data from JSON files.
@@ -25,8 +32,7 @@ def load_data() -> Dict[str, List[Dict]]:
     data = {}
     for file in OUTPUT_DIR.glob("*.json"):
         try:
-            with open(file, 'r', encoding='utf-8') as f:
-                data[file.stem] = json.load(f)
+            data[file.stem] = orjson.loads(file.read_bytes())
             logger.info(f"Loaded {len(data[file.stem])} listings from {file.name}")
         except Exception as e:
             logger.error(f"Error loading {file.name}: {e}")
@@ -50,6 +56,34 @@ def preprocess_text(text: str) -> str:
     return text
 
 
+def load_or_fit_idf(X, corpus_hash: str) -> np.ndarray:
+    """Load the IDF vector for a corpus from cache, fitting it on a miss.
+
+    Args:
+        X: Hashed term-count matrix of the corpus
+        corpus_hash (str): Hash identifying the corpus
+
+    Returns:
+        np.ndarray: IDF weight per hashed feature
+    """
+    cache_file = CACHE_DIR / f"tfidf_{corpus_hash}.npy"
+    if cache_file.exists():
+        try:
+            idf = np.load(cache_file)
+            logger.info(f"Loaded cached IDF vector from {cache_file}")
+            return idf
+        except Exception as e:
+            logger.warning(f"Could not load cached IDF vector {cache_file}: {e}")
+
+    idf = TfidfTransformer().fit(X).idf_
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        np.save(cache_file, idf)
+    except Exception as e:
+        logger.warning(f"Could not cache IDF vector to {cache_file}: {e}")
+    return idf
+
+
 def cluster_jobs(data: Dict[str, List[Dict]], n_clusters: int = 5) -> Dict[str, List[Dict]]:
     """Cluster job listings based on title and description.
 
@@ -76,12 +110,23 @@ def cluster_jobs(data: Dict[str, List[Dict]], n_clusters: int = 5) -> Dict[str,
         logger.error("No valid job listings found for clustering")
         return data
 
-    # Create TF-IDF vectors
-    vectorizer = TfidfVectorizer(max_features=1000)
-    X = vectorizer.fit_transform([job['text'] for job in all_jobs])
+    # Create TF-IDF vectors (hashing avoids a separate vocabulary pass)
+    hasher = HashingVectorizer(n_features=2**18, alternate_sign=False, norm=None)
+    X = hasher.transform(job['text'] for job in all_jobs)
+
+    # Reuse the IDF vector from a previous run on the same corpus
+    digest = hashlib.blake2b(digest_size=16)
+    for job in all_jobs:
+        digest.update(job['text'].encode('utf-8'))
+        digest.update(b'\0')
+    idf = load_or_fit_idf(X, digest.hexdigest())
+
+    # The hashed counts are a fresh matrix, so IDF weighting can scale it in place
+    X.data *= idf[X.indices]
+    normalize(X, norm='l2', copy=False)
 
     # Perform clustering
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42)
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=1024, n_init=3, random_state=42)
     clusters = kmeans.fit_predict(X)
 
     # Add cluster labels to job listings
@@ -102,32 +147,37 @@ def analyze_prices(data: Dict[str, List[Dict]]) -> None:
     Args:
         data (Dict[str, List[Dict]]): Clustered job listings data
     """
-    # Prepare data for visualization
-    plot_data = []
+    # Collect candidate rows; price strings are parsed in one vectorized pass
+    candidates = []
     for platform, listings in data.items():
         for job in listings:
             if 'price' in job and job['price'] and 'cluster' in job:
-                try:
-                    # Extract numeric price value (adjust based on actual format)
-                    price_str = job['price'].replace('¥', '').replace(',', '').strip()
-                    price = float(price_str)
-                    plot_data.append({
-                        'platform': platform,
-                        'cluster': f"Cluster {job['cluster']}",
-                        'price': price
-                    })
-                except (ValueError, AttributeError) as e:
-                    logger.warning(f"Could not parse price '{job.get('price')}': {e}")
-
-    if not plot_data:
+                candidates.append({
+                    'platform': platform,
+                    'cluster': f"Cluster {job['cluster']}",
+                    'price_str': job['price']
+                })
+
+    if not candidates:
         logger.error("No valid price data found for analysis")
         return
 
-    # Create DataFrame
-    df = pd.DataFrame(plot_data)
+    # Extract numeric price value (adjust based on actual format)
+    df = pd.DataFrame(candidates)
+    df['price'] = pd.to_numeric(
+        df['price_str'].astype(str).str.replace(r'[¥,\s]', '', regex=True),
+        errors='coerce'
+    )
+    invalid = df['price'].isna()
+    if invalid.any():
+        logger.warning(f"Could not parse {int(invalid.sum())} prices, e.g. '{df.loc[invalid, 'price_str'].iloc[0]}'")
+    df = df.dropna(subset=['price']).drop(columns='price_str')
+
+    if df.empty:
+        logger.error("No valid price data found for analysis")
+        return
 
-    # Set up the plot style
-    plt.style.use('seaborn-v0_8')
+    # Set up the figure
     fig, axes = plt.subplots(2, 1, figsize=(12, 10))
 
     # Plot 1: Price distribution by cluster
@@ -145,10 +195,11 @@ def analyze_prices(data: Dict[str, List[Dict]]) -> None:
     axes[1].tick_params(axis='x', rotation=45)
 
     # Adjust layout and save
-    plt.tight_layout()
+    fig.tight_layout()
     output_dir = Path("analysis")
     output_dir.mkdir(exist_ok=True)
-    plt.savefig(output_dir / "price_analysis.png")
+    fig.savefig(output_dir / "price_analysis.png")
+    plt.close(fig)
     logger.info("Saved price analysis visualization")
 
 
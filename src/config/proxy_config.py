@@ -1,10 +1,12 @@
 """
 Proxy configuration for web scraping.
 """
+from collections import deque
 from typing import Dict, Optional, List
-import random
 import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 
 class ProxyConfig:
@@ -22,8 +24,18 @@ class ProxyConfig:
             "method": "http"  # Changed to HTTP
         }
         
+        # Persistent HTTP session so proxy API calls reuse pooled connections
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
         # Cache for proxy IPs and expiration time
-        self.proxy_pool = []  # List of available proxies
+        self.proxy_pool = deque(maxlen=64)  # Available proxies, used round-robin
         self.last_request_time = 0  # Last time we requested new proxies
         self.request_interval = 60  # Minimum seconds between API requests
         
@@ -35,6 +47,15 @@ class ProxyConfig:
         
         logger.info("Initialized proxy configuration")
         
+    def _next_proxy(self) -> str:
+        """Rotate the pool and return the next proxy in round-robin order.
+        
+        Returns:
+            str: Proxy URL
+        """
+        self.proxy_pool.rotate(-1)
+        return self.proxy_pool[0]
+        
     def _fetch_new_proxy(self) -> Optional[str]:
         """Fetch new proxies from the API and add them to the pool.
         
@@ -50,14 +71,14 @@ class ProxyConfig:
             logger.warning(f"Too soon to request new proxies. Please wait {self.request_interval - (current_time - self.last_request_time):.1f} seconds")
             # Try to use existing proxy from pool
             if self.proxy_pool:
-                proxy = random.choice(self.proxy_pool)
+                proxy = self._next_proxy()
                 logger.info(f"Using existing proxy from pool: {proxy}")
                 return proxy
             return None
             
         try:
             logger.debug(f"Fetching new proxies from: {self.api_url}")
-            response = requests.get(self.api_url, params=self.api_params, timeout=10)
+            response = self._session.get(self.api_url, params=self.api_params, timeout=10)
             
             if response.status_code == 200:
                 # API returns one or more IP:PORT in text format, one per line
@@ -76,7 +97,7 @@ class ProxyConfig:
                 
                 if self.proxy_pool:
                     self.last_request_time = current_time
-                    return random.choice(self.proxy_pool)
+                    return self._next_proxy()
                     
                 logger.error(f"No valid proxies in response: {proxy_list}")
                 return None
@@ -100,7 +121,7 @@ class ProxyConfig:
             
         # Try to get a proxy from the pool first
         if self.proxy_pool:
-            proxy = random.choice(self.proxy_pool)
+            proxy = self._next_proxy()
             logger.debug(f"Using proxy from pool: {proxy}")
             return {"http": proxy}
             
@@ -2,14 +2,15 @@
 Main script to run the job listing scrapers.
 """
 import asyncio
-import json
 from pathlib import Path
 import sys
 
+import orjson
 from loguru import logger
 
 from src.scrapers.yuanjisong_scraper import YuanjisongScraper
 from src.scrapers.sxsapi_scraper import SxsapiScraper
+from src.utils.loop import run
 
 
 def setup_logging():
@@ -19,18 +20,28 @@ def setup_logging():
     
     logger.remove()  # Remove default handler
     
-    # Add handlers for both file and console output
+    # Add handlers for both file and console output. enqueue=True hands
+    # records to a background worker so sink writes never block the event loop.
     logger.add(
         sys.stderr,
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-        level="INFO"
+        level="INFO",
+        enqueue=True
     )
     logger.add(
         log_path / "scraper.log",
         rotation="1 day",
         retention="7 days",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}",
-        level="DEBUG"
+        level="DEBUG",
+        enqueue=True
+    )
+
+
+def _dump_json(data, path: Path):
+    """Serialize data with orjson and write it to path."""
+    path.write_bytes(
+        orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
     )
 
 
@@ -59,8 +70,7 @@ async def main():
         # Save combined results
         output_dir = Path("output")
         output_dir.mkdir(exist_ok=True)
-        with open(output_dir / "all_jobs.json", 'w', encoding='utf-8') as f:
-            json.dump(combined_results, f, ensure_ascii=False, indent=2)
+        await asyncio.to_thread(_dump_json, combined_results, output_dir / "all_jobs.json")
         logger.info("Saved combined results")
 
     except Exception as e:
@@ -71,4 +81,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    run(main())
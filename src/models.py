@@ -2,7 +2,7 @@
 Data models for the project.
 """
 
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -26,7 +26,7 @@ class FreelanceProject:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the project to a dictionary."""
-        data = asdict(self)
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
         
         # 转换日期时间为 ISO 格式字符串
         if self.published_at:
@@ -2,27 +2,32 @@
 Job classification module for analyzing and categorizing freelance job listings.
 """
 
-import json
+import functools
+import hashlib
+import os
 from pathlib import Path
 import numpy as np
+import orjson
 import pandas as pd
-from sentence_transformers import SentenceTransformer
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
-import matplotlib.pyplot as plt
-import seaborn as sns
 from loguru import logger
 import re
 from typing import List, Dict, Tuple, Optional, Any
-import jieba
 import asyncio
 import sys
-import matplotlib as mpl
+
+# Heavy ML / plotting dependencies (sentence_transformers, sklearn, matplotlib,
+# seaborn, jieba) are imported inside the methods that use them.
 
 from src.config.config import Config
 from tools.llm_api import query_llm, create_llm_client
 
+# Sentence embedding model; its name also keys the on-disk embedding cache
+_EMBEDDING_MODEL = 'all-mpnet-base-v2'
+
+# Precompiled patterns for text preprocessing
+_RE_PUNCT = re.compile(r'[^\w\s]')
+_RE_WS = re.compile(r'\s+')
+
 def convert_to_serializable(obj: Any) -> Any:
     """Convert numpy types to Python native types for JSON serialization.
     
@@ -40,6 +45,62 @@ def convert_to_serializable(obj: Any) -> Any:
         return obj.tolist()
     return obj
 
+@functools.lru_cache(maxsize=None)
+def _load_jieba():
+    """Import the fastest available jieba implementation."""
+    try:
+        import jieba_fast as jieba
+    except ImportError:
+        import jieba
+    return jieba
+
+@functools.lru_cache(maxsize=100_000)
+def _preprocess_cached(text: str) -> str:
+    """Clean and tokenize text, memoized on the raw input string.
+    
+    Args:
+        text (str): Raw text
+        
+    Returns:
+        str: Preprocessed text
+    """
+    # Remove special characters and extra whitespace
+    text = _RE_PUNCT.sub(' ', text)
+    text = _RE_WS.sub(' ', text)
+    
+    # Tokenize Chinese text
+    words = _load_jieba().cut(text)
+    text = ' '.join(words)
+    
+    return text.strip()
+
+def _fit_score(features: np.ndarray, n_clusters: int) -> float:
+    """Fit a clustering model and return its (subsampled) silhouette score.
+    
+    Args:
+        features (np.ndarray): Feature matrix
+        n_clusters (int): Number of clusters
+        
+    Returns:
+        float: Silhouette score
+    """
+    from sklearn.cluster import MiniBatchKMeans
+    from sklearn.metrics import silhouette_score
+    
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        batch_size=1024,
+        n_init=3,
+        random_state=42
+    )
+    cluster_labels = kmeans.fit_predict(features)
+    return float(silhouette_score(
+        features,
+        cluster_labels,
+        sample_size=min(2000, len(features)),
+        random_state=42
+    ))
+
 class JobClassifier:
     """Classifier for analyzing and categorizing freelance job listings."""
     
@@ -49,15 +110,17 @@ class JobClassifier:
         Args:
             config (Config): Configuration object
         """
+        from sentence_transformers import SentenceTransformer
+        import matplotlib.pyplot as plt
+        
         self.config = config
         self.logger = logger
         
         # Initialize sentence transformer model
-        self.model = SentenceTransformer('all-mpnet-base-v2')
+        self.model = SentenceTransformer(_EMBEDDING_MODEL)
         
         # Initialize clustering model
         self.kmeans = None
-        self.scaler = StandardScaler()
         
         # Initialize LLM client
         self.llm_client = create_llm_client(provider="openai")
@@ -70,6 +133,9 @@ class JobClassifier:
         
     def _setup_chinese_font(self):
         """Setup Chinese font support for matplotlib."""
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+        
         # Try different Chinese fonts in order of preference
         chinese_fonts = [
             'Microsoft YaHei',  # Windows
@@ -85,15 +151,12 @@ class JobClassifier:
             'Source Han Sans CN'  # Linux
         ]
         
-        # Find the first available font
-        available_font = None
-        for font in chinese_fonts:
-            try:
-                if any(f for f in mpl.font_manager.findSystemFonts() if font.lower() in f.lower()):
-                    available_font = font
-                    break
-            except:
-                continue
+        # Find the first available font using matplotlib's cached font list
+        installed_fonts = {f.name.lower() for f in mpl.font_manager.fontManager.ttflist}
+        available_font = next(
+            (font for font in chinese_fonts if font.lower() in installed_fonts),
+            None
+        )
         
         if available_font:
             self.logger.info(f"Using Chinese font: {available_font}")
@@ -110,30 +173,36 @@ class JobClassifier:
         Returns:
             pd.DataFrame: Combined dataset
         """
-        all_data = []
-        working_files = 0
+        frames = []
         
         # Load data from each source
         for source in ['yuanjisong', 'sxsapi']:
             try:
                 file_path = Path(self.config.output_dir) / f"{source}.json"
                 self.logger.info(f"Loading data from {file_path}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Add source field
-                    for item in data:
-                        item['source'] = source
-                    all_data.extend(data)
-                    working_files += 1
-                    self.logger.info(f"Successfully loaded {len(data)} records from {source}")
+                data = orjson.loads(file_path.read_bytes())
+                # Add source field as a whole column
+                frames.append(pd.DataFrame.from_records(data).assign(source=source))
+                self.logger.info(f"Successfully loaded {len(data)} records from {source}")
             except Exception as e:
                 self.logger.error(f"Error loading data from {source}: {str(e)}")
                 
-        if working_files == 0:
+        if not frames:
             raise ValueError("No data files could be loaded successfully")
                 
-        # Convert to DataFrame
-        df = pd.DataFrame(all_data)
+        # Combine into a single DataFrame
+        df = pd.concat(frames, ignore_index=True, copy=False)
+        
+        # Use compact dtypes: categoricals for labels, Arrow-backed strings for text
+        for column in ('source', 'platform'):
+            if column in df:
+                df[column] = df[column].astype('category')
+        try:
+            for column in ('title', 'description'):
+                if column in df:
+                    df[column] = df[column].astype('string[pyarrow]')
+        except ImportError:
+            self.logger.debug("pyarrow not installed, keeping object dtype for text columns")
         self.logger.info(f"Loaded {len(df)} job listings in total")
         
         return df
@@ -150,15 +219,7 @@ class JobClassifier:
         if not isinstance(text, str):
             return ""
             
-        # Remove special characters and extra whitespace
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Tokenize Chinese text
-        words = jieba.cut(text)
-        text = ' '.join(words)
-        
-        return text.strip()
+        return _preprocess_cached(text)
         
     def prepare_features(self, df: pd.DataFrame) -> Tuple[np.ndarray, List[str]]:
         """Prepare features for clustering using sentence transformers.
@@ -173,20 +234,96 @@ class JobClassifier:
         df['text'] = df['title'].fillna('') + ' ' + df['description'].fillna('')
         
         # Preprocess text
-        df['processed_text'] = df['text'].apply(self.preprocess_text)
+        df['processed_text'] = df['text'].map(self.preprocess_text)
         
         # Generate embeddings using sentence transformers
         self.logger.info("Generating embeddings using sentence transformers...")
-        embeddings = self.model.encode(df['processed_text'].tolist(), show_progress_bar=True)
+        embeddings = self._encode_with_cache(df['processed_text'].tolist())
         
-        # Scale features
-        features = self.scaler.fit_transform(embeddings)
+        # Embeddings are already unit-norm; renormalize to undo float16 rounding
+        features = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        features = np.ascontiguousarray(features, dtype=np.float32)
         
         # Generate feature names (dimensions)
         feature_names = [f"dim_{i}" for i in range(embeddings.shape[1])]
         
         return features, feature_names
         
+    def _encode_with_cache(self, texts: List[str]) -> np.ndarray:
+        """Encode texts, reusing embeddings cached on disk from previous runs.
+        
+        Embeddings are appended as raw float16 rows to a per-model
+        ``embeddings_<model>.f16`` file, with a JSON index mapping the BLAKE2
+        hash of each text to its row, so only texts that have not been seen
+        before are passed to the model. New rows are flushed before the index
+        is atomically replaced, so the index never refers to missing rows.
+        
+        Args:
+            texts (List[str]): Preprocessed texts
+            
+        Returns:
+            np.ndarray: Embedding matrix with one row per text
+        """
+        cache_dir = Path(self.config.output_dir)
+        model_id = re.sub(r'[^\w.-]', '_', _EMBEDDING_MODEL)
+        cache_file = cache_dir / f'embeddings_{model_id}.f16'
+        index_file = cache_dir / f'embeddings_{model_id}.json'
+        
+        keys = [hashlib.blake2b(t.encode('utf-8'), digest_size=16).hexdigest() for t in texts]
+        
+        # Load existing cache; rows past the index are leftovers of an interrupted write
+        index: Dict[str, int] = {}
+        dim = None
+        rows = 0
+        if cache_file.exists() and index_file.exists():
+            try:
+                meta = orjson.loads(index_file.read_bytes())
+                index, dim = meta['rows'], meta['dim']
+                rows = cache_file.stat().st_size // (dim * 2)
+                if index and max(index.values()) >= rows:
+                    raise ValueError(f"index refers to row {max(index.values())} of {rows}")
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable embedding cache: {str(e)}")
+                index, dim, rows = {}, None, 0
+        
+        # Encode only texts that are not cached yet
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in index and key not in missing:
+                missing[key] = text
+        
+        if missing:
+            self.logger.info(f"Encoding {len(missing)} new texts ({len(texts) - len(missing)} cached)")
+            new_embeddings = self.model.encode(
+                list(missing.values()),
+                batch_size=64,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=True
+            ).astype(np.float16)
+            dim = new_embeddings.shape[1]
+            
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'ab') as f:
+                # Drop any partial or unindexed rows before appending
+                f.truncate(rows * dim * 2)
+                f.write(new_embeddings.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            
+            for i, key in enumerate(missing):
+                index[key] = rows + i
+            rows += len(missing)
+            
+            tmp_file = index_file.with_name(index_file.name + '.tmp')
+            tmp_file.write_bytes(orjson.dumps({'model': _EMBEDDING_MODEL, 'dim': dim, 'rows': index}))
+            os.replace(tmp_file, index_file)
+        else:
+            self.logger.info(f"Loaded all {len(texts)} embeddings from cache")
+        
+        cached = np.memmap(cache_file, dtype=np.float16, mode='r', shape=(rows, dim))
+        return np.asarray(cached[[index[key] for key in keys]], dtype=np.float32)
+        
     def find_optimal_clusters(self, features: np.ndarray, max_clusters: int = 10) -> int:
         """Find optimal number of clusters using silhouette score.
         
@@ -197,29 +334,27 @@ class JobClassifier:
         Returns:
             int: Optimal number of clusters
         """
-        scores = []
+        from joblib import Parallel, delayed
+        import matplotlib.pyplot as plt
+        
         n_clusters_range = range(2, max_clusters + 1)
         
-        for n_clusters in n_clusters_range:
-            kmeans = KMeans(
-                n_clusters=n_clusters,
-                random_state=42,
-                n_init=10
-            )
-            cluster_labels = kmeans.fit_predict(features)
-            silhouette_avg = silhouette_score(features, cluster_labels)
-            scores.append(silhouette_avg)
+        # Fit all candidate cluster counts in parallel
+        scores = Parallel(n_jobs=-1)(
+            delayed(_fit_score)(features, n_clusters) for n_clusters in n_clusters_range
+        )
+        for n_clusters, silhouette_avg in zip(n_clusters_range, scores):
             self.logger.info(f"Silhouette score for {n_clusters} clusters: {silhouette_avg:.3f}")
             
         # Plot silhouette scores
-        plt.figure(figsize=(10, 6))
-        plt.plot(n_clusters_range, scores, 'bo-')
-        plt.xlabel('聚类数量')
-        plt.ylabel('轮廓系数')
-        plt.title('轮廓系数与聚类数量关系图')
-        plt.grid(True)
-        plt.savefig(Path(self.config.output_dir) / 'silhouette_scores.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.plot(n_clusters_range, scores, 'bo-')
+        ax.set_xlabel('聚类数量')
+        ax.set_ylabel('轮廓系数')
+        ax.set_title('轮廓系数与聚类数量关系图')
+        ax.grid(True)
+        fig.savefig(Path(self.config.output_dir) / 'silhouette_scores.png', dpi=300, bbox_inches='tight')
+        plt.close(fig)
         
         # Return optimal number of clusters
         optimal_clusters = n_clusters_range[np.argmax(scores)]
@@ -236,7 +371,7 @@ class JobClassifier:
         Returns:
             List[str]: Cluster labels
         """
-        labels = []
+        prompts = []
         
         for cluster_id in range(len(np.unique(cluster_ids))):
             # Get sample of jobs from cluster
@@ -249,23 +384,32 @@ class JobClassifier:
             for _, job in sample_jobs.iterrows():
                 prompt += f"Title: {job['title']}\n"
                 prompt += f"Description: {job['description'][:200]}...\n\n"
-            
-            try:
-                # Get label from LLM using the local implementation
-                response = query_llm(
+            prompts.append(prompt)
+        
+        # Query the LLM for all clusters concurrently (query_llm is blocking)
+        responses = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    query_llm,
                     prompt=prompt,
                     client=self.llm_client,
                     provider="openai"
                 )
-                
-                if response and not response.startswith('Error:'):
-                    labels.append(response.strip())
-                    self.logger.info(f"Generated label for cluster {cluster_id}: {response.strip()}")
-                else:
-                    self.logger.error(f"Failed to get response for cluster {cluster_id}: {response}")
-                    labels.append(f"类别 {cluster_id + 1}")
-            except Exception as e:
-                self.logger.error(f"Error generating label for cluster {cluster_id}: {str(e)}")
+                for prompt in prompts
+            ),
+            return_exceptions=True
+        )
+        
+        labels = []
+        for cluster_id, response in enumerate(responses):
+            if isinstance(response, Exception):
+                self.logger.error(f"Error generating label for cluster {cluster_id}: {str(response)}")
+                labels.append(f"类别 {cluster_id + 1}")
+            elif response and not response.startswith('Error:'):
+                labels.append(response.strip())
+                self.logger.info(f"Generated label for cluster {cluster_id}: {response.strip()}")
+            else:
+                self.logger.error(f"Failed to get response for cluster {cluster_id}: {response}")
                 labels.append(f"类别 {cluster_id + 1}")
                 
         return labels
@@ -278,32 +422,34 @@ class JobClassifier:
             cluster_ids (np.ndarray): Cluster assignments
             cluster_labels (List[str]): Cluster labels
         """
-        plt.figure(figsize=(15, 8))
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
+        fig, ax = plt.subplots(figsize=(15, 8))
         
         # Create violin plot
         df['cluster'] = cluster_ids
         df['cluster_label'] = df['cluster'].map(dict(enumerate(cluster_labels)))
         
         # Handle different price fields from different sources
-        df['price'] = df.apply(
-            lambda x: x.get('total_price', x.get('price', 0)),
-            axis=1
-        )
+        missing = pd.Series(np.nan, index=df.index)
+        price = df.get('total_price', missing).combine_first(df.get('price', missing))
+        df['price'] = pd.to_numeric(price, errors='coerce').fillna(0).astype(np.float64)
         
         # Remove outliers for better visualization
         df['price'] = df['price'].clip(upper=df['price'].quantile(0.95))
         
         # Create plot
-        sns.violinplot(data=df, x='cluster_label', y='price')
-        plt.xticks(rotation=45, ha='right')
-        plt.xlabel('工作类别')
-        plt.ylabel('价格 (¥)')
-        plt.title('各类别工作价格分布')
+        sns.violinplot(data=df, x='cluster_label', y='price', ax=ax)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+        ax.set_xlabel('工作类别')
+        ax.set_ylabel('价格 (¥)')
+        ax.set_title('各类别工作价格分布')
         
         # Save plot with high DPI and tight layout
-        plt.tight_layout()
-        plt.savefig(Path(self.config.output_dir) / 'price_distributions.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.tight_layout()
+        fig.savefig(Path(self.config.output_dir) / 'price_distributions.png', dpi=300, bbox_inches='tight')
+        plt.close(fig)
         
     def generate_cluster_summary(self, df: pd.DataFrame, cluster_ids: np.ndarray, cluster_labels: List[str]) -> Dict:
         """Generate summary statistics for each cluster.
@@ -323,6 +469,7 @@ class JobClassifier:
         
         for cluster_id, label in enumerate(cluster_labels):
             cluster_df = df[df['cluster'] == cluster_id]
+            titles = cluster_df['title'].dropna()
             
             # Calculate statistics
             stats = {
@@ -331,7 +478,7 @@ class JobClassifier:
                 'median_price': float(cluster_df['price'].median()),
                 'min_price': float(cluster_df['price'].min()),
                 'max_price': float(cluster_df['price'].max()),
-                'sample_titles': cluster_df['title'].sample(min(5, len(cluster_df))).tolist()
+                'sample_titles': titles.sample(min(5, len(titles))).tolist()
             }
             
             summary[label] = stats
@@ -344,6 +491,8 @@ class JobClassifier:
         Returns:
             Dict: Analysis results
         """
+        from sklearn.cluster import KMeans
+        
         # Load and preprocess data
         df = self.load_data()
         features, feature_names = self.prepare_features(df)
@@ -352,7 +501,13 @@ class JobClassifier:
         n_clusters = self.find_optimal_clusters(features)
         
         # Perform clustering
-        self.kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        self.kmeans = KMeans(
+            n_clusters=n_clusters,
+            random_state=42,
+            n_init=3,
+            algorithm='elkan',
+            tol=1e-3
+        )
         cluster_ids = self.kmeans.fit_predict(features)
         
         # Generate cluster labels
@@ -364,11 +519,9 @@ class JobClassifier:
         # Generate summary
         summary = self.generate_cluster_summary(df, cluster_ids, cluster_labels)
         
-        # Convert numpy types to Python native types for JSON serialization
-        feature_importance = {
-            name: convert_to_serializable(value)
-            for name, value in zip(feature_names, self.kmeans.cluster_centers_.mean(axis=0))
-        }
+        # tolist() yields native Python floats, ready for JSON serialization
+        centers_mean = self.kmeans.cluster_centers_.mean(axis=0).astype(np.float64)
+        feature_importance = dict(zip(feature_names, centers_mean.tolist()))
         
         # Save results
         results = {
@@ -377,7 +530,9 @@ class JobClassifier:
             'feature_importance': feature_importance
         }
         
-        with open(Path(self.config.output_dir) / 'analysis_results.json', 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        output_file = Path(self.config.output_dir) / 'analysis_results.json'
+        output_file.write_bytes(
+            orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
             
         return results 
\ No newline at end of file
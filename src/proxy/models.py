@@ -2,11 +2,21 @@
 Proxy models for the project.
 """
 
+import sys
 from dataclasses import dataclass, field
-from typing import Set
+from typing import FrozenSet, Optional
 from datetime import datetime
 
-@dataclass
+# Fields that make up the proxy URL; changing any of them invalidates the cached URL
+_URL_FIELDS = frozenset({'protocol', 'username', 'password', 'host', 'port'})
+
+# Bit assigned to each supported protocol in Proxy.protocol_mask
+PROTOCOL_BITS = {'http': 1, 'https': 2, 'socks4': 4, 'socks5': 8}
+
+# slots=True is only available on Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Proxy:
     """Represents a proxy server."""
     
@@ -19,14 +29,34 @@ class Proxy:
     is_valid: bool = False
     response_time: float = float('inf')
     fail_count: int = 0
-    working_protocols: Set[str] = field(default_factory=set)
+    protocol_mask: int = 0  # Bitmask of working protocols, see PROTOCOL_BITS
+    _url_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        """Set an attribute, dropping the cached URL if it depends on it."""
+        # object.__setattr__ rather than super(): slots=True replaces the class
+        object.__setattr__(self, name, value)
+        if name in _URL_FIELDS:
+            object.__setattr__(self, '_url_cache', None)
+    
+    def __post_init__(self):
+        """Intern the protocol string, shared by many proxy instances."""
+        self.protocol = sys.intern(self.protocol)
+    
+    @property
+    def working_protocols(self) -> FrozenSet[str]:
+        """Get the protocols this proxy is known to work with."""
+        return frozenset(
+            protocol for protocol, bit in PROTOCOL_BITS.items()
+            if self.protocol_mask & bit
+        )
     
     @property
     def url(self) -> str:
-        """Get the proxy URL."""
-        if self.username and self.password:
-            return f"{self.protocol}://{self.username}:{self.password}@{self.host}:{self.port}"
-        return f"{self.protocol}://{self.host}:{self.port}"
+        """Get the proxy URL (built once and cached)."""
+        if self._url_cache is None:
+            self._url_cache = self.get_url_with_protocol(self.protocol)
+        return self._url_cache
     
     def get_url_with_protocol(self, protocol: str) -> str:
         """Get the proxy URL with a specific protocol."""
@@ -36,7 +66,9 @@ class Proxy:
     
     def add_working_protocol(self, protocol: str):
         """Add a working protocol."""
-        self.working_protocols.add(protocol)
+        if protocol not in PROTOCOL_BITS:
+            raise ValueError(f"Unsupported proxy protocol: {protocol}")
+        self.protocol_mask |= PROTOCOL_BITS[protocol]
     
     def update_status(self, is_valid: bool, response_time: float = None):
         """Update proxy status."""
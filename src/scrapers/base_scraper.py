@@ -1,37 +1,50 @@
 """
 Base scraper class with common functionality for all platform scrapers.
 """
-import json
-import time
+import asyncio
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Dict, List, Optional
+from urllib.parse import urlparse
 
 import aiohttp
-import requests
-from bs4 import BeautifulSoup
+import orjson
+from aiohttp_retry import ExponentialRetry, RetryClient
+from aiolimiter import AsyncLimiter
 from loguru import logger
 
-from src.config.config import (OUTPUT_DIR, PROXY_API_PARAMS, PROXY_API_URL,
-                             REQUEST_DELAY, REQUEST_RETRY, REQUEST_TIMEOUT)
+from src.config.config import REQUEST_TIMEOUT
 
 
 class BaseScraper(ABC):
     """Base scraper class that implements common functionality."""
 
-    def __init__(self, platform_name: str, output_dir: str = "output"):
+    def __init__(self, platform_name: str, output_dir: str = "output",
+                 connection_limit: int = 32, connection_limit_per_host: int = 8,
+                 requests_per_second: float = 10):
         """Initialize the scraper.
 
         Args:
             platform_name (str): Name of the platform being scraped
             output_dir (str): Directory to save results
+            connection_limit (int): Maximum number of pooled connections
+            connection_limit_per_host (int): Maximum pooled connections per host
+            requests_per_second (float): Maximum request rate per host
         """
         self.platform_name = platform_name
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.requests_per_second = requests_per_second
+        self._limiters: Dict[str, AsyncLimiter] = {}
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.output_file = self.output_dir / f"{platform_name}.json"
+        self.checkpoint_file = self.output_dir / f"{platform_name}.ndjson"
+        self._checkpoint = None
         self.session = None
+        self.retry_client = None
         self.proxy = None
+        self._proxy_session: Optional[aiohttp.ClientSession] = None
         
         # Configure proxy API
         self.proxy_api_url = "https://api.xiaoxiangdaili.com/ip/get"
@@ -50,7 +63,24 @@ class BaseScraper(ABC):
         """Initialize aiohttp session with proxy."""
         if self.session is None:
             self.proxy = await self._get_proxy()
-            self.session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.connection_limit_per_host,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True,
+                force_close=False
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+            self.retry_client = RetryClient(
+                client_session=self.session,
+                retry_options=ExponentialRetry(
+                    attempts=3,
+                    start_timeout=2,
+                    factor=2,
+                    statuses={500, 502, 503, 504},
+                    exceptions={aiohttp.ClientError, asyncio.TimeoutError}
+                )
+            )
             logger.info(f"Initialized session with proxy: {self.proxy}")
 
     async def close_session(self):
@@ -58,7 +88,11 @@ class BaseScraper(ABC):
         if self.session:
             await self.session.close()
             self.session = None
+            self.retry_client = None
             logger.info("Closed session")
+        if self._proxy_session:
+            await self._proxy_session.close()
+            self._proxy_session = None
 
     async def _get_proxy(self) -> Optional[str]:
         """Get a proxy from the proxy API.
@@ -67,8 +101,14 @@ class BaseScraper(ABC):
             Optional[str]: Proxy URL if successful, None otherwise
         """
         try:
-            response = requests.get(self.proxy_api_url, params=self.proxy_api_params)
-            data = response.json()
+            if self._proxy_session is None or self._proxy_session.closed:
+                # Kept open so repeated proxy lookups reuse the same TLS connection
+                self._proxy_session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                    timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+                )
+            async with self._proxy_session.get(self.proxy_api_url, params=self.proxy_api_params) as response:
+                data = await response.json(content_type=None)
             logger.debug(f"Proxy API response: {data}")
             
             if data.get("code") == 200 and data.get("data"):
@@ -84,8 +124,24 @@ class BaseScraper(ABC):
             logger.error(f"Error getting proxy: {e}")
             return None
 
+    def _get_limiter(self, url: str) -> AsyncLimiter:
+        """Get the rate limiter for the host of a URL.
+
+        Args:
+            url (str): URL to be requested
+
+        Returns:
+            AsyncLimiter: Token-bucket limiter shared by all requests to that host
+        """
+        host = urlparse(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = AsyncLimiter(max_rate=self.requests_per_second, time_period=1)
+            self._limiters[host] = limiter
+        return limiter
+
     async def _make_request(self, url: str) -> Optional[str]:
-        """Make an HTTP request with retry logic.
+        """Make an HTTP request, retrying transient failures with exponential backoff.
 
         Args:
             url (str): URL to request
@@ -93,43 +149,56 @@ class BaseScraper(ABC):
         Returns:
             Optional[str]: Response text if successful, None otherwise
         """
-        for attempt in range(3):  # 3 retries
-            try:
-                if not self.session:
-                    await self.init_session()
+        if not self.session:
+            await self.init_session()
 
-                async with self.session.get(
+        try:
+            async with self._get_limiter(url):
+                async with self.retry_client.get(
                     url,
                     proxy=self.proxy,
-                    timeout=30
+                    timeout=aiohttp.ClientTimeout(total=30)
                 ) as response:
                     if response.status == 200:
                         return await response.text()
                     logger.warning(f"Request failed with status {response.status}")
-            except Exception as e:
-                logger.error(f"Request error: {e}")
-                await self.close_session()  # Reset session on error
-            
-            if attempt < 2:  # Don't sleep on last attempt
-                wait_time = 2 * (attempt + 1)
-                logger.info(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
+        except aiohttp.ClientConnectorError as e:
+            logger.error(f"Connection error: {e}")
+            await self.close_session()  # Reset session only on connector failures
+        except Exception as e:
+            logger.error(f"Request error: {e}")
         
         return None
 
     def save_results(self, results: List[Dict]):
-        """Save scraped results to JSON file.
+        """Append scraped results to the NDJSON checkpoint file.
+
+        The file is opened once with a 1MB write buffer, so each call only
+        costs the new records instead of rewriting everything saved so far.
 
         Args:
             results (List[Dict]): List of scraped job listings
         """
         try:
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
-            logger.info(f"Saved {len(results)} results to {self.output_file}")
+            if self._checkpoint is None:
+                self._checkpoint = open(self.checkpoint_file, 'ab', buffering=1 << 20)
+            self._checkpoint.write(b''.join(
+                orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS) + b'\n'
+                for result in results
+            ))
+            logger.debug(f"Appended {len(results)} results to {self.checkpoint_file}")
         except Exception as e:
             logger.error(f"Error saving results: {e}")
 
+    def flush_results(self):
+        """Flush buffered results and close the NDJSON checkpoint file."""
+        if self._checkpoint is not None:
+            try:
+                self._checkpoint.close()
+            except Exception as e:
+                logger.error(f"Error flushing results: {e}")
+            self._checkpoint = None
+
     @abstractmethod
     async def scrape(self, max_pages: int = 5) -> List[Dict]:
         """Scrape job listings from the platform.
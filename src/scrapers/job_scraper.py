@@ -2,12 +2,16 @@
 Job scraper implementation using the web_scraper tool.
 """
 import asyncio
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Set, Union
+from urllib.parse import urlparse
 
-from bs4 import BeautifulSoup
+import orjson
+from aiolimiter import AsyncLimiter
 from loguru import logger
+from selectolax.lexbor import LexborHTMLParser
 
 # Fix import path
 import sys
@@ -15,79 +19,202 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 from tools.web_scraper import WebScraper
 from src.config.config import YUANJISONG_URL, SXSAPI_URL
 
+# Field name -> CSS class of the element holding it (adjust based on actual HTML)
+_YUANJISONG_FIELDS = {
+    'title': 'job-title',
+    'description': 'job-description',
+    'price': 'price',
+    'deadline': 'deadline',
+    'post_time': 'post-time'
+}
+_SXSAPI_FIELDS = {
+    'title': 'project-title',
+    'description': 'project-description',
+    'price': 'project-price',
+    'deadline': 'project-deadline',
+    'post_time': 'project-post-time'
+}
+
+
+def _extract_fields(html: Union[str, bytes], fields: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Extract the text of the first element carrying each field's class.
+
+    All fields are collected in a single walk over the document instead of
+    one selector traversal per field.
+
+    Args:
+        html (Union[str, bytes]): HTML content of the page
+        fields (Dict[str, str]): Mapping of field name to CSS class
+
+    Returns:
+        Dict[str, Optional[str]]: Field values, None where no element matched
+    """
+    by_class = {css_class: name for name, css_class in fields.items()}
+    values = dict.fromkeys(fields)
+    remaining = len(fields)
+
+    root = LexborHTMLParser(html).root
+    if root is None:
+        return values
+
+    for node in root.traverse():
+        classes = node.attributes.get('class')
+        if not classes:
+            continue
+        for css_class in classes.split():
+            name = by_class.get(css_class)
+            if name is not None and values[name] is None:
+                values[name] = node.text().strip()
+                remaining -= 1
+        if not remaining:
+            break
+
+    return values
+
+
+def _parse_yuanjisong_listing(html: Union[str, bytes]) -> Optional[Dict]:
+    """Parse a yuanjisong.com job listing.
+
+    Args:
+        html (Union[str, bytes]): HTML content of the page
+
+    Returns:
+        Optional[Dict]: Job details if successful, None otherwise
+    """
+    try:
+        return _extract_fields(html, _YUANJISONG_FIELDS)
+    except Exception as e:
+        logger.error(f"Error parsing yuanjisong listing: {e}")
+        return None
+
+
+def _parse_sxsapi_listing(html: Union[str, bytes]) -> Optional[Dict]:
+    """Parse a sxsapi.com job listing.
+
+    Args:
+        html (Union[str, bytes]): HTML content of the page
+
+    Returns:
+        Optional[Dict]: Job details if successful, None otherwise
+    """
+    try:
+        return _extract_fields(html, _SXSAPI_FIELDS)
+    except Exception as e:
+        logger.error(f"Error parsing sxsapi listing: {e}")
+        return None
+
 
 class JobScraper:
     """Job scraper for freelance programming platforms."""
 
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", max_concurrent_pages: int = 16,
+                 requests_per_second: float = 10):
         """Initialize the job scraper.
 
         Args:
             output_dir (str, optional): Directory to save results. Defaults to "output".
+            max_concurrent_pages (int, optional): Maximum number of pages fetched at once
+                across all platforms. Defaults to 16.
+            requests_per_second (float, optional): Maximum request rate per host. Defaults to 10.
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.scraper = WebScraper(max_concurrent=3, output_dir=output_dir)
+        self._sem = asyncio.Semaphore(max_concurrent_pages)
+        self.requests_per_second = requests_per_second
+        self._limiters: Dict[str, AsyncLimiter] = {}
+        self._parse_pool: Optional[ProcessPoolExecutor] = None  # Started on first parse
+        self._seen_urls: Optional[Set[str]] = None  # URLs fetched during scrape_all
 
-    def _parse_yuanjisong_listing(self, html: str) -> Optional[Dict]:
-        """Parse a yuanjisong.com job listing.
+    def _get_limiter(self, url: str) -> AsyncLimiter:
+        """Get the rate limiter for the host of a URL.
 
         Args:
-            html (str): HTML content of the page
+            url (str): URL to be requested
 
         Returns:
-            Optional[Dict]: Job details if successful, None otherwise
+            AsyncLimiter: Token-bucket limiter shared by all requests to that host
         """
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract job details (adjust selectors based on actual HTML)
-            title = soup.select_one('.job-title')
-            description = soup.select_one('.job-description')
-            price = soup.select_one('.price')
-            deadline = soup.select_one('.deadline')
-            post_time = soup.select_one('.post-time')
-
-            return {
-                'title': title.text.strip() if title else None,
-                'description': description.text.strip() if description else None,
-                'price': price.text.strip() if price else None,
-                'deadline': deadline.text.strip() if deadline else None,
-                'post_time': post_time.text.strip() if post_time else None
-            }
-        except Exception as e:
-            logger.error(f"Error parsing yuanjisong listing: {e}")
-            return None
-
-    def _parse_sxsapi_listing(self, html: str) -> Optional[Dict]:
-        """Parse a sxsapi.com job listing.
+        host = urlparse(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = AsyncLimiter(max_rate=self.requests_per_second, time_period=1)
+            self._limiters[host] = limiter
+        return limiter
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _fetch_pages(self, urls: List[str]) -> List[Dict]:
+        """Fetch pages with concurrency bounded across all platforms.
 
         Args:
-            html (str): HTML content of the page
+            urls (List[str]): URLs to fetch
 
         Returns:
-            Optional[Dict]: Job details if successful, None otherwise
+            List[Dict]: Fetch results with 'url' and 'content' for the pages that loaded
         """
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Extract job details (adjust selectors based on actual HTML)
-            title = soup.select_one('.project-title')
-            description = soup.select_one('.project-description')
-            price = soup.select_one('.project-price')
-            deadline = soup.select_one('.project-deadline')
-            post_time = soup.select_one('.project-post-time')
-
-            return {
-                'title': title.text.strip() if title else None,
-                'description': description.text.strip() if description else None,
-                'price': price.text.strip() if price else None,
-                'deadline': deadline.text.strip() if deadline else None,
-                'post_time': post_time.text.strip() if post_time else None
-            }
-        except Exception as e:
-            logger.error(f"Error parsing sxsapi listing: {e}")
-            return None
+        # Skip duplicates within the batch and URLs already fetched in this run
+        urls = list(dict.fromkeys(urls))
+        if self._seen_urls is not None:
+            urls = [url for url in urls if url not in self._seen_urls]
+            self._seen_urls.update(urls)
+
+        async def fetch(url: str) -> Optional[Dict]:
+            async with self._sem, self._get_limiter(url):
+                return await self.scraper.scrape_page(url)
+
+        results = await asyncio.gather(*(fetch(url) for url in urls))
+        return [result for result in results if result]
+
+    async def _parse_results(self, results: List[Dict], parser: Callable[[str], Optional[Dict]]) -> List[Dict]:
+        """Parse fetched pages in the process pool, keeping the event loop free.
+
+        Args:
+            results (List[Dict]): Fetch results with 'url' and 'content'
+            parser (Callable[[str], Optional[Dict]]): Module-level listing parser
+
+        Returns:
+            List[Dict]: Parsed job listings
+        """
+        loop = asyncio.get_running_loop()
+        pages = [result for result in results if result['content']]
+        if not pages:
+            return []
+
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        parsed = await asyncio.gather(*(
+            loop.run_in_executor(self._parse_pool, parser, result['content'])
+            for result in pages
+        ))
+
+        listings = []
+        for result, listing in zip(pages, parsed):
+            if listing:
+                listing['url'] = result['url']
+                listings.append(listing)
+        return listings
+
+    async def close(self):
+        """Shut down the parser process pool and the web scraper's sessions."""
+        if self._parse_pool is not None:
+            pool, self._parse_pool = self._parse_pool, None
+            await asyncio.to_thread(pool.shutdown, cancel_futures=True)
+        await self.scraper.close()
+
+    async def _save_async(self, listings: List[Dict], output_file: Path):
+        """Write listings to a JSON file without blocking the event loop.
+
+        Args:
+            listings (List[Dict]): Job listings to save
+            output_file (Path): Destination file
+        """
+        data = orjson.dumps(listings, option=orjson.OPT_INDENT_2)
+        await asyncio.to_thread(output_file.write_bytes, data)
 
     async def scrape_yuanjisong(self, max_pages: int = 5) -> List[Dict]:
         """Scrape job listings from yuanjisong.com.
@@ -99,20 +226,12 @@ class JobScraper:
             List[Dict]: List of job listings
         """
         urls = [YUANJISONG_URL.format(page) for page in range(1, max_pages + 1)]
-        results = await self.scraper.scrape_urls(urls, wait_for='.job-list')
+        results = await self._fetch_pages(urls)
 
-        listings = []
-        for result in results:
-            if result['content']:
-                listing = self._parse_yuanjisong_listing(result['content'])
-                if listing:
-                    listing['url'] = result['url']
-                    listings.append(listing)
+        listings = await self._parse_results(results, _parse_yuanjisong_listing)
 
         # Save results
-        output_file = self.output_dir / "yuanjisong.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(listings, f, ensure_ascii=False, indent=2)
+        await self._save_async(listings, self.output_dir / "yuanjisong.json")
 
         return listings
 
@@ -126,37 +245,41 @@ class JobScraper:
             List[Dict]: List of job listings
         """
         urls = [SXSAPI_URL.format(page) for page in range(1, max_pages + 1)]
-        results = await self.scraper.scrape_urls(urls, wait_for='.project-list')
+        results = await self._fetch_pages(urls)
 
-        listings = []
-        for result in results:
-            if result['content']:
-                listing = self._parse_sxsapi_listing(result['content'])
-                if listing:
-                    listing['url'] = result['url']
-                    listings.append(listing)
+        listings = await self._parse_results(results, _parse_sxsapi_listing)
 
         # Save results
-        output_file = self.output_dir / "sxsapi.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(listings, f, ensure_ascii=False, indent=2)
+        await self._save_async(listings, self.output_dir / "sxsapi.json")
 
         return listings
 
     async def scrape_all(self, max_pages: int = 5) -> Dict[str, List[Dict]]:
         """Scrape job listings from all platforms.
 
+        The parser process pool and browser sessions are closed when the run
+        ends; they are started again if the scraper is reused.
+
         Args:
             max_pages (int, optional): Maximum number of pages to scrape. Defaults to 5.
 
         Returns:
             Dict[str, List[Dict]]: Dictionary mapping platform names to their job listings
         """
-        tasks = [
-            self.scrape_yuanjisong(max_pages),
-            self.scrape_sxsapi(max_pages)
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        self._seen_urls = set()
+        try:
+            tasks = [
+                self.scrape_yuanjisong(max_pages),
+                self.scrape_sxsapi(max_pages)
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._seen_urls = None
+            await self.close()
+
+        for platform, result in zip(('yuanjisong', 'sxsapi'), results):
+            if isinstance(result, Exception):
+                logger.error(f"Error scraping {platform}: {result}")
 
         return {
             'yuanjisong': results[0] if not isinstance(results[0], Exception) else [],
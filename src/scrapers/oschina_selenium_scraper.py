@@ -2,6 +2,8 @@
 OSCHINA API analyzer using Selenium.
 """
 
+import atexit
+import re
 import time
 import os
 from selenium import webdriver
@@ -12,7 +14,7 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-import json
+import orjson
 from typing import List, Dict, Any, Optional
 import logging
 
@@ -20,16 +22,38 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 同时包含 'api'（不区分大小写）和 'zb.oschina.net' 的 URL，一次扫描完成匹配
+API_URL_PATTERN = re.compile(r'(?i:api).*zb\.oschina\.net|zb\.oschina\.net.*(?i:api)')
+
+# 与 API 分析无关的静态资源，在浏览器中直接屏蔽
+BLOCKED_RESOURCE_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico', '*.webp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf'
+]
+
 class OSChinaAPIAnalyzer:
     """Analyzer for OSCHINA API using Selenium."""
     
-    def __init__(self):
-        """Initialize the analyzer."""
+    # 所有分析器实例共享同一个 Chrome WebDriver
+    _driver = None
+    
+    def __init__(self, shutdown_on_exit: bool = False):
+        """Initialize the analyzer.
+        
+        Args:
+            shutdown_on_exit (bool): Quit the shared WebDriver when the context
+                manager exits instead of only resetting its state.
+        """
         self.base_url = 'https://zb.oschina.net/projects/list.html'
-        self.setup_driver()
+        self.shutdown_on_exit = shutdown_on_exit
+        self.driver = self.setup_driver()
+        
+    @classmethod
+    def setup_driver(cls):
+        """Setup the shared Chrome WebDriver with necessary options."""
+        if cls._driver is not None:
+            return cls._driver
         
-    def setup_driver(self):
-        """Setup Chrome WebDriver with necessary options."""
         try:
             chrome_options = Options()
             # 添加必要的 Chrome 选项
@@ -41,16 +65,29 @@ class OSChinaAPIAnalyzer:
             chrome_options.add_argument('--ignore-certificate-errors')  # 忽略证书错误
             chrome_options.add_argument('--ignore-ssl-errors')  # 忽略 SSL 错误
             
-            # 启用性能日志记录
+            # 启用性能日志记录（只记录 Network 域事件）
             chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            chrome_options.add_experimental_option('perfLoggingPrefs', {
+                'enableNetwork': True,
+                'enablePage': False
+            })
             
             # 设置用户代理
             chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36')
             
-            # 使用 webdriver_manager 安装和管理 ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # 优先使用 CHROMEDRIVER_PATH，否则由 webdriver_manager 安装和管理 ChromeDriver
+            driver_path = os.environ.get('CHROMEDRIVER_PATH') or ChromeDriverManager().install()
+            service = Service(executable_path=driver_path)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+            
+            # 通过 CDP 启用网络事件，并屏蔽图片和字体请求以减少日志条目
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_PATTERNS})
+            
+            cls._driver = driver
+            atexit.register(cls.shutdown)
             logger.info("Chrome WebDriver 初始化成功")
+            return driver
             
         except Exception as e:
             logger.error(f"设置 Chrome WebDriver 时出错: {e}")
@@ -80,7 +117,11 @@ class OSChinaAPIAnalyzer:
             # 分析网络请求
             for entry in logs:
                 try:
-                    log = json.loads(entry['message'])['message']
+                    # 在解析 JSON 之前先用子串快速过滤
+                    raw = entry['message']
+                    if 'Network.requestWillBeSent' not in raw:
+                        continue
+                    log = orjson.loads(raw)['message']
                     
                     if (
                         'Network.requestWillBeSent' in log['method']
@@ -90,7 +131,7 @@ class OSChinaAPIAnalyzer:
                         url = request.get('url', '')
                         
                         # 只关注 API 请求
-                        if 'api' in url.lower() and 'zb.oschina.net' in url:
+                        if API_URL_PATTERN.search(url):
                             api_info = {
                                 'url': url,
                                 'method': request.get('method', ''),
@@ -142,7 +183,11 @@ class OSChinaAPIAnalyzer:
             # 分析 XHR 请求
             for entry in logs:
                 try:
-                    log = json.loads(entry['message'])['message']
+                    # 在解析 JSON 之前先用子串快速过滤
+                    raw = entry['message']
+                    if 'Network.requestWillBeSent' not in raw or 'XHR' not in raw:
+                        continue
+                    log = orjson.loads(raw)['message']
                     
                     if (
                         'Network.requestWillBeSent' in log['method']
@@ -152,7 +197,7 @@ class OSChinaAPIAnalyzer:
                         request = log['params']['request']
                         url = request.get('url', '')
                         
-                        if 'api' in url.lower() and 'zb.oschina.net' in url:
+                        if API_URL_PATTERN.search(url):
                             xhr_info = {
                                 'url': url,
                                 'method': request.get('method', ''),
@@ -173,14 +218,37 @@ class OSChinaAPIAnalyzer:
         
         return xhr_requests
     
-    def close(self):
-        """Close the WebDriver."""
-        if hasattr(self, 'driver'):
+    def reset(self):
+        """Reset the shared WebDriver state between analyses."""
+        try:
+            self.driver.delete_all_cookies()
+            self.driver.get('about:blank')
+            # 丢弃残留的性能日志
+            self.driver.get_log('performance')
+        except Exception as e:
+            logger.error(f"重置 WebDriver 时出错: {e}")
+    
+    @classmethod
+    def shutdown(cls):
+        """Quit the shared WebDriver."""
+        if cls._driver is not None:
             try:
-                self.driver.quit()
+                cls._driver.quit()
                 logger.info("WebDriver 已关闭")
             except Exception as e:
                 logger.error(f"关闭 WebDriver 时出错: {e}")
+            cls._driver = None
+    
+    def close(self, shutdown: bool = False):
+        """Release the WebDriver.
+        
+        Args:
+            shutdown (bool): Quit the shared WebDriver instead of resetting it for reuse.
+        """
+        if shutdown:
+            self.shutdown()
+        else:
+            self.reset()
             
     def __enter__(self):
         """Context manager enter."""
@@ -188,12 +256,12 @@ class OSChinaAPIAnalyzer:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
-        self.close()
+        self.close(shutdown=self.shutdown_on_exit)
 
 def main():
     """Main function to run the analyzer."""
     try:
-        with OSChinaAPIAnalyzer() as analyzer:
+        with OSChinaAPIAnalyzer(shutdown_on_exit=True) as analyzer:
             # 分析所有网络请求
             logger.info("开始分析网络请求...")
             api_requests = analyzer.analyze_network_requests()
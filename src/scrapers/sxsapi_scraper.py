@@ -1,17 +1,82 @@
 """
 Scraper implementation for sxsapi.com.
 """
-import json
 import re
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from loguru import logger
 import asyncio
+import functools
+import orjson
+import random
+import time
 
 from src.config.config import Config
 from src.scrapers.base_scraper import BaseScraper
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 
+# Navigation links on list pages and end-of-description markers on detail pages
+_SKIP_RE = re.compile('登录|注册|会员|友链合作')
+_STOP_TOKENS = ('附件', '报名列表', '阅读全部', '开发者工作指南')
+
+# Description lines dropped from the sliced section: headings, images and
+# repeated section labels
+_DESC_CLEAN_RE = re.compile(r'^[^\S\n]*(?:#|!\[)[^\n]*$|^[^\n]*项目描述[^\n]*$', re.MULTILINE)
+
+# Wait for job listings container, then scroll to trigger any lazy loading
+_LIST_WAIT_FOR = ".project-list, .project-grid, .job-list"
+_LIST_JS = """
+    // Scroll to bottom to trigger any lazy loading
+    window.scrollTo(0, document.body.scrollHeight);
+    // Wait a bit for content to load
+    await new Promise(r => setTimeout(r, 2000));
+    // Scroll back to top
+    window.scrollTo(0, 0);
+"""
+
+# Detail pages use more general selectors
+_DETAIL_WAIT_FOR = "main, article, .content, .container"
+_DETAIL_JS = """
+    // Scroll through the page to ensure all content is loaded
+    window.scrollTo(0, document.body.scrollHeight);
+    await new Promise(r => setTimeout(r, 1000));
+    window.scrollTo(0, 0);
+"""
+
+# Seconds a fetched proxy is reused before asking for a new one
+_PROXY_TTL = 30
+
+# Deletes the closing '>' left over from markdown autolinks
+_URL_DEL = str.maketrans('', '', '>')
+
+# Error text that marks a detail fetch as worth retrying
+_TRANSIENT_RE = re.compile(r'429|rate limit|quota|timeout|timed out', re.IGNORECASE)
+
+# List page scan: one pass over the whole markdown, dispatched on the matching
+# alternative. Every alternative is anchored at a line start, so the engine
+# rejects mid-line positions at the first token. Navigation lines are consumed
+# whole so nothing on them matches.
+# Format: ##  [ 项目标题 ](https://sxsapi.com/</post/235>) ￥ 预算
+_LIST_UNION = re.compile(
+    rf'^(?:(?P<skip>[^\n]*(?:{_SKIP_RE.pattern})[^\n]*)'
+    r'|[^\S\n]*(?:'
+    r'(?P<title>##[^\S\n]*\[[^\S\n]*(?P<name>[^\]\n]+)\][^\S\n]*'
+    r'\((?P<url>https?://[^)\n]+/post/\d+[^)\n]*)\)[^\S\n]*￥[^\S\n]*(?P<price>[\d~万千以上以下待商议]+))'
+    r'|(?P<duration>\*[^\S\n]*(?P<days>\d+天|商议工期))'
+    r'|(?P<deadline>\*[^\S\n]*竞标截止：(?P<date>\d{4}-\d{2}-\d{2}))'
+    r'))',
+    re.MULTILINE,
+)
+
+# Detail page patterns
+_DETAIL_TITLE_RE = re.compile(r'#\s*([^#\n]+?)(?:\s*￥|$)')
+_PRICE_RE = re.compile(r'￥\s*([\d~万千以上以下待商议]+)')
+_DURATION_RE = re.compile(r'工期[：要求]*：\s*(\d+天|商议工期)')
+_DEADLINE_RE = re.compile(r'竞标截止：(\d{4}-\d{2}-\d{2})')
+_SKILLS_RE = re.compile(r'技能要求：([^\n]+)')
+_COOP_RE = re.compile(r'合作倾向：([^\n]+)')
+
+@functools.lru_cache(maxsize=4096)
 def clean_url(url: str) -> str:
     """Clean up URL by removing artifacts and normalizing format.
     
@@ -21,8 +86,10 @@ def clean_url(url: str) -> str:
     Returns:
         str: Cleaned URL
     """
-    # Remove </> artifacts and any text after space
-    url = url.split()[0].replace('</', '').replace('>', '')
+    # Remove any text after space, then </> artifacts when present
+    url = url.split(None, 1)[0]
+    if '<' in url or '>' in url:
+        url = url.replace('</', '').translate(_URL_DEL)
     
     # Remove javascript: links
     if 'javascript:' in url:
@@ -47,44 +114,31 @@ class SxsapiScraper(BaseScraper):
         self.config = config
         self.logger = logger
         
-        # Configure crawler for list page
+        # Configure crawler for list and detail pages; the proxy is passed per request
         self.list_config = CrawlerRunConfig(
-            verbose=True,
-            word_count_threshold=config.word_count_threshold,
-            excluded_tags=config.excluded_tags,
-            page_timeout=config.page_timeout,
-            simulate_user=config.simulate_user,
-            magic=config.magic,
-            wait_for=".project-list, .project-grid, .job-list",  # Wait for job listings container
-            js_code="""
-                // Scroll to bottom to trigger any lazy loading
-                window.scrollTo(0, document.body.scrollHeight);
-                // Wait a bit for content to load
-                await new Promise(r => setTimeout(r, 2000));
-                // Scroll back to top
-                window.scrollTo(0, 0);
-            """
+            **config.get_crawler_config(wait_for=_LIST_WAIT_FOR, js_code=_LIST_JS)
         )
-        
-        # Configure crawler for detail page
         self.detail_config = CrawlerRunConfig(
-            verbose=True,
-            word_count_threshold=config.word_count_threshold,
-            excluded_tags=config.excluded_tags,
-            page_timeout=config.page_timeout,
-            simulate_user=config.simulate_user,
-            magic=config.magic,
-            wait_for="main, article, .content, .container",  # More general selectors
-            js_code="""
-                // Scroll through the page to ensure all content is loaded
-                window.scrollTo(0, document.body.scrollHeight);
-                await new Promise(r => setTimeout(r, 1000));
-                window.scrollTo(0, 0);
-            """
+            **config.get_crawler_config(wait_for=_DETAIL_WAIT_FOR, js_code=_DETAIL_JS)
         )
         
         self.base_url = 'https://sxsapi.com'
         
+        # Maximum number of detail pages fetched in parallel
+        self.detail_concurrency = getattr(config, 'detail_concurrency', 8)
+        
+        # Number of list pages fetched together in one pagination step
+        self.list_concurrency = getattr(config, 'list_concurrency', 2)
+        
+        # Earliest monotonic time at which the next request may be dispatched
+        self._next_ok = 0.0
+        
+        # Project URLs scraped during scrape()
+        self._seen_urls: Optional[Set[str]] = None
+        
+        # Last proxy handed out and the monotonic time it was fetched
+        self._proxy_cache: Tuple[Optional[Dict], float] = (None, 0.0)
+        
         # Configure proxy API
         self.proxy_api_url = "https://api.xiaoxiangdaili.com/ip/get"
         self.proxy_api_params = {
@@ -97,91 +151,163 @@ class SxsapiScraper(BaseScraper):
             "province": ""
         }
 
-    async def scrape_page(self, page: int = 1) -> List[Dict]:
+    async def _get_page_proxy(self) -> Optional[Dict]:
+        """Return the cached proxy, fetching a new one once it is older than the TTL.
+        
+        Returns:
+            Optional[Dict]: Proxy configuration or None
+        """
+        proxy, fetched_at = self._proxy_cache
+        now = time.monotonic()
+        if proxy and now - fetched_at < _PROXY_TTL:
+            return proxy
+        
+        # The proxy API call is blocking, keep it off the event loop
+        proxy = await asyncio.to_thread(self.config.get_proxy)
+        self._proxy_cache = (proxy, now)
+        return proxy
+
+    async def _throttle(self) -> None:
+        """Wait for the next request slot, spacing requests by ``config.rate_limit``.
+        
+        Slots are reserved before sleeping, so concurrent callers queue up
+        behind each other instead of waking at the same time.
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_ok)
+        self._next_ok = slot + self.config.rate_limit
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _arun_with_retry(self, crawler: AsyncWebCrawler, url: str, config: CrawlerRunConfig,
+                               proxy: Optional[Dict], max_attempts: int = 3, base: float = 0.5):
+        """Run the crawler on a URL, retrying rate limits and timeouts with backoff.
+        
+        Args:
+            crawler (AsyncWebCrawler): Open crawler
+            url (str): URL to crawl
+            config (CrawlerRunConfig): Crawler run configuration
+            proxy (Optional[Dict]): Proxy configuration
+            max_attempts (int): Maximum number of attempts
+            base (float): Initial backoff delay in seconds, doubled per attempt
+            
+        Returns:
+            The crawl result of the last attempt
+        """
+        for attempt in range(max_attempts):
+            last_attempt = attempt == max_attempts - 1
+            try:
+                await self._throttle()
+                result = await crawler.arun(url, config=config, proxy=proxy)
+            except Exception as e:
+                if last_attempt or not (isinstance(e, asyncio.TimeoutError) or _TRANSIENT_RE.search(str(e))):
+                    raise
+                reason = str(e) or type(e).__name__
+            else:
+                transient = getattr(result, 'status_code', None) == 429 or (
+                    result is not None and not getattr(result, 'success', True)
+                    and _TRANSIENT_RE.search(getattr(result, 'error_message', None) or '')
+                )
+                if last_attempt or not transient:
+                    return result
+                reason = getattr(result, 'error_message', None) or 'HTTP 429'
+            
+            delay = base * 2 ** attempt + random.random() * 0.1
+            self.logger.warning(f"Transient error on {url} ({reason}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def scrape_page(self, page: int = 1, crawler: Optional[AsyncWebCrawler] = None,
+                          sem: Optional[asyncio.Semaphore] = None, checkpoint: bool = True) -> List[Dict]:
         """Scrape a single page of job listings.
         
         Args:
             page (int): Page number to scrape
+            crawler (Optional[AsyncWebCrawler]): Open crawler to reuse. A
+                temporary one is started when omitted.
+            sem (Optional[asyncio.Semaphore]): Semaphore bounding list and
+                detail requests, shared across pages. A per-page one of
+                ``detail_concurrency`` slots is used when omitted.
+            checkpoint (bool): Stream each project to the NDJSON checkpoint as
+                soon as it is done. Callers that may discard the page pass False
+                and save the projects they keep themselves.
             
         Returns:
             List[Dict]: List of scraped job listings
         """
+        if crawler is None:
+            async with AsyncWebCrawler() as crawler:
+                return await self.scrape_page(page, crawler, sem, checkpoint)
+        if sem is None:
+            sem = asyncio.Semaphore(self.detail_concurrency)
+        
         self.logger.info(f"Scraping page {page} from sxsapi.com")
         
-        # Initialize crawler
-        async with AsyncWebCrawler() as crawler:
-            # Get crawler config with proxy
-            config = CrawlerRunConfig(
-                **self.config.get_crawler_config(
-                    wait_for=".project-list, .project-grid, .job-list",
-                    js_code="""
-                        // Scroll to bottom to trigger any lazy loading
-                        window.scrollTo(0, document.body.scrollHeight);
-                        // Wait a bit for content to load
-                        await new Promise(r => setTimeout(r, 2000));
-                        // Scroll back to top
-                        window.scrollTo(0, 0);
-                    """
-                )
-            )
-            
-            # Get proxy configuration
-            proxy = self.config.get_proxy()
-            if proxy:
-                self.logger.info(f"Using proxy: {proxy.get('http')}")
-            else:
-                self.logger.warning("No proxy available")
-            
-            # Scrape list page
-            url = f"https://sxsapi.com/?pageNo={page}"
-            result = await crawler.arun(url, config=config, proxy=proxy)
+        # Get proxy configuration
+        proxy = await self._get_page_proxy()
+        if proxy:
+            self.logger.info(f"Using proxy: {proxy.get('http')}")
+        else:
+            self.logger.warning("No proxy available")
+        
+        # Scrape list page
+        url = f"https://sxsapi.com/?pageNo={page}"
+        async with sem:
+            await self._throttle()
+            result = await crawler.arun(url, config=self.list_config, proxy=proxy)
+        
+        if not result or not result.markdown:
+            self.logger.error(f"Failed to scrape page {page}")
+            return []
             
-            if not result or not result.markdown:
-                self.logger.error(f"Failed to scrape page {page}")
+        # Extract project links and basic info
+        projects = self.extract_project_links(result.markdown)
+        self.logger.info(f"Found {len(projects)} projects on page {page}")
+        
+        # Skip projects already scraped in this run; an all-duplicate page
+        # means pagination has wrapped around, so it ends the crawl too
+        if self._seen_urls is not None:
+            seen = self._seen_urls
+            projects = [p for p in projects if not (p['url'] in seen or seen.add(p['url']))]
+            if not projects:
+                self.logger.info(f"All projects on page {page} were already scraped")
                 return []
-                
-            # Extract project links and basic info
-            projects = self.extract_project_links(result.markdown)
-            self.logger.info(f"Found {len(projects)} projects on page {page}")
-            
-            # Scrape detail pages
-            detailed_projects = []
-            for project in projects:
+        
+        # Scrape detail pages concurrently, bounded by the semaphore
+        async def _fetch_detail(project: Dict) -> Optional[Dict]:
+            async with sem:
                 try:
-                    # Configure crawler for detail page
-                    detail_config = CrawlerRunConfig(
-                        **self.config.get_crawler_config(
-                            wait_for="main, article, .content, .container",
-                            js_code="""
-                                // Scroll through the page to ensure all content is loaded
-                                window.scrollTo(0, document.body.scrollHeight);
-                                await new Promise(r => setTimeout(r, 1000));
-                                window.scrollTo(0, 0);
-                            """
-                        )
-                    )
-                    
-                    # Scrape detail page
-                    detail_result = await crawler.arun(project['url'], config=detail_config, proxy=proxy)
-                    if detail_result and detail_result.markdown:
-                        # Extract details and merge with basic info
-                        details = self.extract_project_details(detail_result.markdown)
-                        if details:
-                            project.update(details)
-                            detailed_projects.append(project)
-                            self.logger.debug(f"Added details for project: {project['url']}")
-                    else:
-                        self.logger.warning(f"Failed to scrape detail page: {project['url']}")
-                        detailed_projects.append(project)  # Add basic info even if detail scraping fails
-                        
+                    detail_result = await self._arun_with_retry(crawler, project['url'], self.detail_config, proxy)
                 except Exception as e:
                     self.logger.error(f"Error scraping detail page {project['url']}: {str(e)}")
-                    detailed_projects.append(project)  # Add basic info even if detail scraping fails
-                    
-            # Save results for this page
-            self.save_results(detailed_projects)
+                    return project  # Add basic info even if detail scraping fails
+            
+            if detail_result and detail_result.markdown:
+                # Extract details and merge with basic info
+                details = self.extract_project_details(detail_result.markdown)
+                if details:
+                    project.update(details)
+                    self.logger.opt(lazy=True).debug("Added details for project: {}", lambda: project['url'])
+                    return project
+                return None
             
-            return detailed_projects
+            self.logger.warning(f"Failed to scrape detail page: {project['url']}")
+            return project  # Add basic info even if detail scraping fails
+        
+        async def _fetch_and_save(project: Dict) -> Optional[Dict]:
+            try:
+                result = await _fetch_detail(project)
+            except Exception as e:
+                self.logger.error(f"Error scraping detail page {project['url']}: {str(e)}")
+                result = project
+            # Stream each project to the NDJSON checkpoint as soon as it is done
+            if result is not None and checkpoint:
+                self.save_results([result])
+            return result
+        
+        results = await asyncio.gather(*[_fetch_and_save(p) for p in projects])
+        detailed_projects = [result for result in results if result is not None]
+        
+        return detailed_projects
 
     def extract_project_links(self, markdown: str) -> List[Dict[str, str]]:
         """Extract project links from markdown content.
@@ -195,36 +321,20 @@ class SxsapiScraper(BaseScraper):
         projects = []
         current_project = {}
         
-        for line in markdown.split('\n'):
-            line = line.strip()
-            
-            # Skip empty lines and navigation links
-            if not line or any(x in line.lower() for x in ['登录', '注册', '会员', '友链合作']):
-                continue
-                
-            # Look for project title and link
-            # Format: ##  [ 项目标题 ](https://sxsapi.com/</post/235>) ￥ 预算
-            title_match = re.search(r'##\s*\[\s*([^\]]+)\s*\]\s*\((https?://[^)]+/post/\d+[^)]*)\)\s*￥\s*([\d~万千以上以下待商议]+)', line)
-            if title_match:
+        for match in _LIST_UNION.finditer(markdown):
+            kind = match.lastgroup
+            if kind == 'title':
                 if current_project:
                     projects.append(current_project)
                 current_project = {
-                    'title': title_match.group(1).strip(),
-                    'url': clean_url(title_match.group(2)),
-                    'price': title_match.group(3).strip()
+                    'title': match.group('name').strip(),
+                    'url': clean_url(match.group('url')),
+                    'price': match.group('price').strip()
                 }
-                continue
-                
-            # Look for duration
-            duration_match = re.search(r'\*\s*(\d+天|商议工期)', line)
-            if duration_match and current_project:
-                current_project['duration'] = duration_match.group(1)
-                continue
-                
-            # Look for deadline
-            deadline_match = re.search(r'\*\s*竞标截止：(\d{4}-\d{2}-\d{2})', line)
-            if deadline_match and current_project:
-                current_project['deadline'] = deadline_match.group(1)
+            elif kind == 'duration' and current_project:
+                current_project['duration'] = match.group('days')
+            elif kind == 'deadline' and current_project:
+                current_project['deadline'] = match.group('date')
                 
         # Add last project if exists
         if current_project:
@@ -244,55 +354,49 @@ class SxsapiScraper(BaseScraper):
         details = {}
         
         # Extract title (format: # 项目标题)
-        title_match = re.search(r'#\s*([^#\n]+?)(?:\s*￥|$)', markdown)
+        title_match = _DETAIL_TITLE_RE.search(markdown)
         if title_match:
             details['title'] = title_match.group(1).strip()
         
         # Extract price (format: ￥ 5千~1万)
-        price_match = re.search(r'￥\s*([\d~万千以上以下待商议]+)', markdown)
+        price_match = _PRICE_RE.search(markdown)
         if price_match:
             details['price'] = price_match.group(1).strip()
         
         # Extract duration (format: 工期：30天 or 工期要求：30天)
-        duration_match = re.search(r'工期[：要求]*：\s*(\d+天|商议工期)', markdown)
+        duration_match = _DURATION_RE.search(markdown)
         if duration_match:
             details['duration'] = duration_match.group(1)
         
         # Extract deadline (format: 竞标截止：2025-03-05)
-        deadline_match = re.search(r'竞标截止：(\d{4}-\d{2}-\d{2})', markdown)
+        deadline_match = _DEADLINE_RE.search(markdown)
         if deadline_match:
             details['deadline'] = deadline_match.group(1)
         
-        # Extract description
-        description = ""
-        description_started = False
-        for line in markdown.split('\n'):
-            line = line.strip()
-            
-            # Start collecting description after "项目描述"
-            if '项目描述' in line:
-                description_started = True
-                continue
-                
-            # Stop at certain markers
-            if description_started:
-                if any(x in line for x in ['附件', '报名列表', '阅读全部', '开发者工作指南']):
-                    break
-                if line and not line.startswith('#') and not line.startswith('!['):
-                    description += line + ' '
-        
-        if description:
-            details['description'] = description.strip()
+        # Extract description: the lines between "项目描述" and the first stop marker
+        start = markdown.find('项目描述')
+        if start != -1:
+            start = markdown.find('\n', start) + 1
+            if start:
+                stops = [i for i in (markdown.find(tok, start) for tok in _STOP_TOKENS) if i != -1]
+                # The line holding the stop marker is excluded as a whole
+                end = markdown.rfind('\n', start, min(stops)) + 1 if stops else len(markdown)
+                chunk = _DESC_CLEAN_RE.sub('', markdown[start:end])
+                description = ' '.join(chunk.split())
+                if description:
+                    details['description'] = description
             
         # Extract skills (format: 技能要求：xxx)
-        skills_match = re.search(r'技能要求：([^\n]+)', markdown)
-        if skills_match:
-            details['skills'] = skills_match.group(1).strip()
+        if '技能要求' in markdown:
+            skills_match = _SKILLS_RE.search(markdown)
+            if skills_match:
+                details['skills'] = skills_match.group(1).strip()
             
         # Extract cooperation preference (format: 合作倾向：xxx)
-        coop_match = re.search(r'合作倾向：([^\n]+)', markdown)
-        if coop_match:
-            details['cooperation'] = coop_match.group(1).strip()
+        if '合作倾向' in markdown:
+            coop_match = _COOP_RE.search(markdown)
+            if coop_match:
+                details['cooperation'] = coop_match.group(1).strip()
         
         return details 
 
@@ -308,43 +412,61 @@ class SxsapiScraper(BaseScraper):
         """
         all_jobs = []
         page = 1
+        done = False
         
-        while True:
-            try:
-                # Stage 1: Get job listings from list page
-                projects = await self.scrape_page(page)
-                if not projects:
-                    logger.warning(f"No projects found on page {page}, stopping pagination")
-                    break
-                
-                # Add projects to results
-                all_jobs.extend(projects)
-                logger.info(f"Added {len(projects)} projects from page {page}")
+        # One semaphore gates list and detail requests across concurrent pages
+        sem = asyncio.Semaphore(self.detail_concurrency)
+        
+        self._seen_urls = set()
+        try:
+            async with AsyncWebCrawler() as crawler:
+                while not done:
+                    # Stage 1: Get job listings from the next batch of list pages
+                    last = page + self.list_concurrency - 1
+                    if max_pages:
+                        last = min(last, max_pages)
+                    batch = range(page, last + 1)
+                    results = await asyncio.gather(
+                        *[self.scrape_page(p, crawler, sem, checkpoint=False) for p in batch],
+                        return_exceptions=True
+                    )
                 
-                # Check if we've reached max_pages
-                if max_pages and page >= max_pages:
-                    logger.info(f"Reached max pages limit ({max_pages})")
-                    break
+                    for p, projects in zip(batch, results):
+                        if isinstance(projects, BaseException):
+                            logger.error(f"Error scraping list page {p}: {str(projects)}")
+                            done = True
+                            break
+                        if not projects:
+                            logger.warning(f"No projects found on page {p}, stopping pagination")
+                            done = True
+                            break
                     
-                # Increment page counter
-                page += 1
+                        # Add projects to results; only kept pages reach the checkpoint
+                        all_jobs.extend(projects)
+                        self.save_results(projects)
+                        logger.info(f"Added {len(projects)} projects from page {p}")
                 
-                # Add delay between pages
-                await asyncio.sleep(self.config.rate_limit)
-                        
-            except Exception as e:
-                logger.error(f"Error scraping list page {page}: {str(e)}")
-                break
+                    # Check if we've reached max_pages
+                    if not done and max_pages and last >= max_pages:
+                        logger.info(f"Reached max pages limit ({max_pages})")
+                        done = True
+                
+                    page = last + 1
+        finally:
+            self._seen_urls = None
         
-        # Save results
-        output_file = Path(self.config.output_dir) / f"{self.platform_name}.json"
-        logger.info(f"Saving {len(all_jobs)} jobs to {output_file}")
+        self.flush_results()
         
-        try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(all_jobs, f, ensure_ascii=False, indent=2)
-            logger.info(f"Successfully saved results to {output_file}")
-        except Exception as e:
-            logger.error(f"Error saving results to {output_file}: {str(e)}")
+        # Save the aggregated JSON array, unless only the NDJSON stream is wanted
+        if getattr(self.config, 'write_json', True):
+            output_file = Path(self.config.output_dir) / f"{self.platform_name}.json"
+            logger.info(f"Saving {len(all_jobs)} jobs to {output_file}")
+        
+            try:
+                with open(output_file, 'wb') as f:
+                    f.write(orjson.dumps(all_jobs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+                logger.info(f"Successfully saved results to {output_file}")
+            except Exception as e:
+                logger.error(f"Error saving results to {output_file}: {str(e)}")
         
         return all_jobs 
\ No newline at end of file
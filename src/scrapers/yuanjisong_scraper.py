@@ -1,20 +1,58 @@
 """
 Scraper implementation for yuanjisong.com.
 """
-import json
 import re
 from pathlib import Path
 from typing import Dict, List, Optional
 from loguru import logger
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from lxml import etree, html as lxml_html
 import asyncio
+import orjson
 from urllib.parse import urljoin
+from itertools import chain
 import logging
 
 from src.config.config import Config
 from src.scrapers.base_scraper import BaseScraper
 from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
 
+# Only job cards are built into the list-page tree
+_LIST_STRAINER = SoupStrainer('div', class_=re.compile(r'\bdiv_bg_color_fff\b'))
+_CARD_CLASSES = 'div_bg_color_fff div_padding_1 hover1 margin_bottom_1'
+
+# Detail page queries, compiled once (CSS equivalents noted alongside)
+def _has_class(name: str) -> str:
+    """XPath predicate matching a single class token, like CSS ``.name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_XP_TITLE = etree.XPath('(//h2)[1]')                                        # h2
+_XP_ROWS = etree.XPath(f'//*[{_has_class("basic_info_row")}]')              # .basic_info_row
+_XP_LABEL = etree.XPath(f'(.//*[{_has_class("font_color_3")}])[1]')         # .font_color_3
+_XP_VALUE = etree.XPath('(.//li[not(following-sibling::*)])[1]')            # li:last-child
+_XP_DESC = etree.XPath(f'(//*[{_has_class("mobmid")}]//p)[1]')              # .mobmid p
+_XP_CREDIT = etree.XPath(f'//*[{_has_class("admin-content-list")}]//li//span//a')  # .admin-content-list li span a
+
+# Basic info row label -> (detail field, parse as integer)
+_LABEL_FIELDS = {
+    '合作方式': ('cooperation_type', False),
+    '预估日薪': ('daily_salary', True),
+    '预估总价': ('total_price', True),
+    '预估工时': ('duration', True),
+    '所在区域': ('location', False),
+}
+_NON_DIGITS_RE = re.compile(r'\D+')
+
+def _label_field(label: str) -> Optional[tuple]:
+    """Look up the detail field for a row label, falling back to substring match."""
+    field = _LABEL_FIELDS.get(label)
+    if field is None:
+        field = next((v for k, v in _LABEL_FIELDS.items() if k in label), None)
+    return field
+
+_URL_FIRST = re.compile(r'\S+')
+_URL_STRIP = re.compile(r'</|>')
+
 def clean_url(url: str) -> str:
     """Clean up URL by removing artifacts and normalizing format.
     
@@ -24,8 +62,11 @@ def clean_url(url: str) -> str:
     Returns:
         str: Cleaned URL
     """
-    # Remove </> artifacts and any text after space
-    url = url.split()[0].replace('</', '').replace('>', '')
+    # Keep the first whitespace-delimited token, then remove </> artifacts
+    match = _URL_FIRST.search(url)
+    if not match:
+        return ''
+    url = _URL_STRIP.sub('', match.group())
     
     # Remove javascript: links
     if 'javascript:' in url:
@@ -37,6 +78,63 @@ def clean_url(url: str) -> str:
         
     return url
 
+def _scan_card(container: Tag) -> Dict[str, Tag]:
+    """Find the field elements of a job card in a single walk over its subtree.
+
+    Each key holds the first matching element in document order, as the
+    separate ``find`` calls did: ``job``/``employer`` links, the ``desc``
+    paragraph, the ``duration`` icon, and the ``price``/``applicants`` counters.
+    """
+    found = {}
+    for el in container.descendants:
+        if not isinstance(el, Tag):
+            continue
+        name = el.name
+        if name == 'a':
+            href = el.get('href')
+            if href is not None:
+                if 'job' not in found and '/job/' in href:
+                    found['job'] = el
+                elif 'employer' not in found and '/employer/' in href:
+                    found['employer'] = el
+        else:
+            cls = el.get('class') or ()
+            if name == 'p' and 'margin_bottom_10' in cls:
+                found.setdefault('desc', el)
+            elif name == 'span' and 'glyphicon-time' in cls:
+                found.setdefault('duration', el)
+            elif name == 'span' and 'rixin-text-jobs' in cls:
+                found.setdefault('price', el)
+            elif name == 'i' and 'i_post_num' in cls:
+                found.setdefault('applicants', el)
+        if len(found) == 6:
+            break
+    return found
+
+# Page scripts shared by the crawler run configs
+_LIST_JS = """
+    // Scroll to bottom to trigger any lazy loading
+    window.scrollTo(0, document.body.scrollHeight);
+    // Wait a bit for content to load
+    await new Promise(r => setTimeout(r, 2000));
+    // Scroll back to top
+    window.scrollTo(0, 0);
+"""
+_DETAIL_JS = """
+    // Scroll through the page to ensure all content is loaded
+    window.scrollTo(0, document.body.scrollHeight);
+    await new Promise(r => setTimeout(r, 1000));
+    window.scrollTo(0, 0);
+"""
+_DETAIL_H2_JS = _DETAIL_JS + """
+    // Wait for content to stabilize
+    await new Promise(r => setTimeout(r, 500));
+"""
+
+def _write_json(path: Path, data, pretty: bool = False):
+    """Serialize data as JSON and write it to path, indented only when pretty."""
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+
 class YuanjisongScraper(BaseScraper):
     """Scraper for yuanjisong.com."""
 
@@ -46,7 +144,10 @@ class YuanjisongScraper(BaseScraper):
         Args:
             config (Config): Configuration object
         """
-        super().__init__("yuanjisong", config.output_dir)
+        super().__init__(
+            "yuanjisong", config.output_dir,
+            requests_per_second=getattr(config, 'requests_per_second', 10)
+        )
         self.config = config
         self.logger = logger
         
@@ -59,14 +160,7 @@ class YuanjisongScraper(BaseScraper):
             simulate_user=config.simulate_user,
             magic=config.magic,
             wait_for=".div_bg_color_fff",  # Wait for job listings container
-            js_code="""
-                // Scroll to bottom to trigger any lazy loading
-                window.scrollTo(0, document.body.scrollHeight);
-                // Wait a bit for content to load
-                await new Promise(r => setTimeout(r, 2000));
-                // Scroll back to top
-                window.scrollTo(0, 0);
-            """
+            js_code=_LIST_JS
         )
         
         # Configure crawler for detail page
@@ -78,16 +172,37 @@ class YuanjisongScraper(BaseScraper):
             simulate_user=config.simulate_user,
             magic=config.magic,
             wait_for=".consultant_title",  # Wait for job detail container
-            js_code="""
-                // Scroll through the page to ensure all content is loaded
-                window.scrollTo(0, document.body.scrollHeight);
-                await new Promise(r => setTimeout(r, 1000));
-                window.scrollTo(0, 0);
-            """
+            js_code=_DETAIL_JS
+        )
+        
+        # Detail page variant used during full scrapes, keyed on the title heading
+        self.detail_config_h2 = CrawlerRunConfig(
+            verbose=True,
+            word_count_threshold=config.word_count_threshold,
+            excluded_tags=config.excluded_tags,
+            page_timeout=config.page_timeout,
+            simulate_user=config.simulate_user,
+            magic=config.magic,
+            wait_for="h2",
+            js_code=_DETAIL_H2_JS
         )
         
         self.base_url = 'https://www.yuanjisong.com'
         
+        # Maximum number of list pages scraped at the same time
+        self.page_concurrency = getattr(config, 'max_concurrent_pages', None) or 5
+        self._page_sem: Optional[asyncio.Semaphore] = None
+        
+        # Maximum number of detail pages fetched at the same time, across all
+        # list pages, and how long one list page waits for its details
+        self.detail_concurrency = getattr(config, 'max_concurrent_details', None) or 10
+        self.detail_batch_timeout = getattr(config, 'detail_batch_timeout', None) or 300
+        self._detail_sem: Optional[asyncio.Semaphore] = None
+        
+        # Browser shared by all list and detail requests, started on first use
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._crawler_lock: Optional[asyncio.Lock] = None
+        
         # Configure proxy API
         self.proxy_api_url = "https://api.xiaoxiangdaili.com/ip/get"
         self.proxy_api_params = {
@@ -100,19 +215,44 @@ class YuanjisongScraper(BaseScraper):
             "province": ""
         }
 
+    async def _ensure_crawler(self) -> AsyncWebCrawler:
+        """Return the shared crawler, starting the browser on first use.
+        
+        Returns:
+            AsyncWebCrawler: Open crawler
+        """
+        if self._crawler_lock is None:
+            self._crawler_lock = asyncio.Lock()
+        async with self._crawler_lock:
+            if self._crawler is None:
+                crawler = AsyncWebCrawler()
+                await crawler.__aenter__()
+                self._crawler = crawler
+        return self._crawler
+
+    async def _close_crawler(self):
+        """Shut down the shared crawler if it was started."""
+        if self._crawler is not None:
+            crawler, self._crawler = self._crawler, None
+            await crawler.__aexit__(None, None, None)
+
     def extract_project_links(self, html_content):
         """Extract project links and basic info from the list page."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        project_containers = soup.find_all('div', class_='div_bg_color_fff div_padding_1 hover1 margin_bottom_1')
-        self.logger.debug(f"Found {len(project_containers)} project containers")
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=_LIST_STRAINER)
+        project_containers = soup.find_all('div', class_=_CARD_CLASSES)
+        self.logger.opt(lazy=True).debug("Found {} project containers", lambda: len(project_containers))
         
         projects = []
         for container in project_containers:
             try:
                 project = {}
                 
-                # Extract title and URL from the first <a> tag containing an <h4>
-                title_link = container.find('a', href=lambda x: x and '/job/' in x)
+                # Locate every field element in one walk over the card
+                found = _scan_card(container)
+                title_link = found.get('job')
+                employer_link = found.get('employer')
+                
+                # Extract title and URL from the job link
                 if title_link:
                     project['url'] = clean_url(title_link['href'])
                     title_elem = title_link.find('b')
@@ -120,14 +260,14 @@ class YuanjisongScraper(BaseScraper):
                         project['title'] = title_elem.text.strip()
                 
                 # Extract description from the <p> with margin_bottom_10 class
-                desc_elem = container.find('p', class_='margin_bottom_10')
+                desc_elem = found.get('desc')
                 if desc_elem:
                     desc_text = desc_elem.get_text(strip=True)
                     if '描述：' in desc_text:
                         project['description'] = desc_text.split('描述：', 1)[1].strip()
                 
                 # Extract duration from the <p> containing glyphicon-time
-                duration_elem = container.find('span', class_='glyphicon-time')
+                duration_elem = found.get('duration')
                 if duration_elem:
                     duration_p = duration_elem.find_parent('p')
                     if duration_p:
@@ -136,7 +276,7 @@ class YuanjisongScraper(BaseScraper):
                             project['duration'] = duration_text.split('工时：', 1)[1].strip()
                 
                 # Extract price from the span with rixin-text-jobs class
-                price_elem = container.find('span', class_='rixin-text-jobs')
+                price_elem = found.get('price')
                 if price_elem:
                     try:
                         project['price'] = int(price_elem.text.strip())
@@ -144,7 +284,7 @@ class YuanjisongScraper(BaseScraper):
                         project['price'] = 0
                 
                 # Extract applicants count from the i_post_num element
-                applicants_elem = container.find('i', class_='i_post_num')
+                applicants_elem = found.get('applicants')
                 if applicants_elem:
                     try:
                         project['applicants'] = int(applicants_elem.text.strip())
@@ -152,7 +292,6 @@ class YuanjisongScraper(BaseScraper):
                         project['applicants'] = 0
                 
                 # Extract employer info from the employer link
-                employer_link = container.find('a', href=lambda x: x and '/employer/' in x)
                 if employer_link:
                     project['employer_url'] = clean_url(employer_link['href'])
                     employer_name = employer_link.find('span')
@@ -162,7 +301,7 @@ class YuanjisongScraper(BaseScraper):
                 # Only append if we have the minimum required fields
                 if all(key in project for key in ['url', 'title']):
                     projects.append(project)
-                    self.logger.debug(f"Extracted project: {json.dumps(project, ensure_ascii=False)}")
+                    self.logger.opt(lazy=True).debug("Extracted project: {}", lambda: orjson.dumps(project).decode())
                 
             except Exception as e:
                 self.logger.error(f"Error extracting project: {str(e)}")
@@ -170,67 +309,63 @@ class YuanjisongScraper(BaseScraper):
         
         self.logger.info(f"Found {len(projects)} projects on page 1")
         if projects:
-            self.logger.debug(f"First project details: {json.dumps(projects[0], ensure_ascii=False, indent=2)}")
+            self.logger.opt(lazy=True).debug(
+                "First project details: {}",
+                lambda: orjson.dumps(projects[0], option=orjson.OPT_INDENT_2).decode()
+            )
         
         return projects
 
     def extract_project_details(self, html):
         """Extract project details from HTML content."""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            tree = lxml_html.fromstring(html)
             
             # Extract title
-            title_elem = soup.select_one('h2')
-            title = title_elem.text.strip() if title_elem else None
+            title_elem = _XP_TITLE(tree)
+            title = title_elem[0].text_content().strip() if title_elem else None
             
             # Extract basic info
             details = {}
             details['title'] = title
             
             # Find all basic info rows
-            basic_info_rows = soup.select('.basic_info_row')
-            for row in basic_info_rows:
-                label_elem = row.select_one('.font_color_3')
+            for row in _XP_ROWS(tree):
+                label_elem = _XP_LABEL(row)
                 if not label_elem:
                     continue
                     
-                label = label_elem.text.strip().rstrip('：')
-                value = row.select_one('li:last-child')
+                label = label_elem[0].text_content().strip().rstrip('：')
+                value = _XP_VALUE(row)
                 if not value:
                     continue
                     
-                value_text = value.text.strip()
+                value_text = value[0].text_content().strip()
                 
-                if '合作方式' in label:
-                    details['cooperation_type'] = value_text
-                elif '预估日薪' in label:
-                    details['daily_salary'] = int(''.join(filter(str.isdigit, value_text)))
-                elif '预估总价' in label:
-                    details['total_price'] = int(''.join(filter(str.isdigit, value_text)))
-                elif '预估工时' in label:
-                    details['duration'] = int(''.join(filter(str.isdigit, value_text)))
-                elif '所在区域' in label:
-                    details['location'] = value_text
+                field = _label_field(label)
+                if field:
+                    name, numeric = field
+                    details[name] = int(_NON_DIGITS_RE.sub('', value_text) or 0) if numeric else value_text
             
             # Extract description
-            desc_elem = soup.select_one('.mobmid p')
+            desc_elem = _XP_DESC(tree)
             if desc_elem:
-                details['description'] = desc_elem.text.strip()
+                details['description'] = desc_elem[0].text_content().strip()
             
             # Extract employer credit info
             try:
-                credit_list = soup.select('.admin-content-list li span a')
+                credit_list = _XP_CREDIT(tree)
                 if len(credit_list) >= 3:
-                    details['employer_projects'] = int(credit_list[0].text.strip())
-                    details['employer_reviews'] = int(credit_list[1].text.strip())
-                    details['employer_complaints'] = int(credit_list[2].text.strip())
+                    details['employer_projects'] = int(credit_list[0].text_content().strip())
+                    details['employer_reviews'] = int(credit_list[1].text_content().strip())
+                    details['employer_complaints'] = int(credit_list[2].text_content().strip())
             except (ValueError, AttributeError, IndexError) as e:
                 self.logger.warning(f"Failed to extract employer credit info: {str(e)}")
                 details['employer_projects'] = 0
                 details['employer_reviews'] = 0
                 details['employer_complaints'] = 0
             
-            self.logger.debug(f"Extracted project details: {details}")
+            self.logger.opt(lazy=True).debug("Extracted project details: {}", lambda: details)
             return details
             
         except Exception as e:
@@ -252,62 +387,52 @@ class YuanjisongScraper(BaseScraper):
         max_retries = self.config.max_retries
         for attempt in range(max_retries):
             try:
-                async with AsyncWebCrawler() as crawler:
-                    # Get crawler config
-                    config = CrawlerRunConfig(
-                        **self.config.get_crawler_config(
-                            wait_for=".div_bg_color_fff",
-                            js_code="""
-                                // Scroll to bottom to trigger any lazy loading
-                                window.scrollTo(0, document.body.scrollHeight);
-                                // Wait a bit for content to load
-                                await new Promise(r => setTimeout(r, 2000));
-                                // Scroll back to top
-                                window.scrollTo(0, 0);
-                            """
-                        )
-                    )
-                    
-                    # Get proxy configuration
-                    proxy = self.config.get_proxy()
-                    if proxy:
-                        logger.info(f"Using proxy: {proxy.get('http')}")
-                    else:
-                        logger.warning("No proxy available")
-                    
-                    result = await crawler.arun(url, config=config, proxy=proxy)
-                    
-                    if not result.success:
-                        logger.error(f"Failed to fetch list page {url}: {result.error_message}")
-                        if attempt < max_retries - 1:
-                            logger.info(f"Retrying in {self.config.retry_delay} seconds...")
-                            await asyncio.sleep(self.config.retry_delay)
-                            continue
-                        return []
-                    
-                    if not result.html:
-                        logger.warning(f"No HTML content in list page {url}")
-                        if attempt < max_retries - 1:
-                            logger.info(f"Retrying in {self.config.retry_delay} seconds...")
-                            await asyncio.sleep(self.config.retry_delay)
-                            continue
-                        return []
-                    
-                    # Log the first 1000 characters of HTML for debugging
-                    if self.config.debug:
-                        logger.debug(f"First 1000 chars of HTML:\n{result.html[:1000]}")
-                    
-                    # Extract project links and metadata
-                    projects = self.extract_project_links(result.html)
-                    logger.info(f"Found {len(projects)} projects on page {page}")
-                    
-                    # Check if we've reached the last page
-                    if not projects:
-                        logger.info(f"No more projects found on page {page}")
-                        return []
-                    
-                    return projects
-                    
+                crawler = await self._ensure_crawler()
+                
+                # Reuse the prebuilt crawler config
+                config = self.list_config
+                
+                # Get proxy configuration
+                proxy = self.config.get_proxy()
+                if proxy:
+                    logger.info(f"Using proxy: {proxy.get('http')}")
+                else:
+                    logger.warning("No proxy available")
+                
+                await self._get_limiter(url).acquire()
+                result = await crawler.arun(url, config=config, proxy=proxy)
+                
+                if not result.success:
+                    logger.error(f"Failed to fetch list page {url}: {result.error_message}")
+                    if attempt < max_retries - 1:
+                        logger.info(f"Retrying in {self.config.retry_delay} seconds...")
+                        await asyncio.sleep(self.config.retry_delay)
+                        continue
+                    return []
+                
+                if not result.html:
+                    logger.warning(f"No HTML content in list page {url}")
+                    if attempt < max_retries - 1:
+                        logger.info(f"Retrying in {self.config.retry_delay} seconds...")
+                        await asyncio.sleep(self.config.retry_delay)
+                        continue
+                    return []
+                
+                # Log the first 1000 characters of HTML for debugging
+                if self.config.debug:
+                    logger.opt(lazy=True).debug("First 1000 chars of HTML:\n{}", lambda: result.html[:1000])
+                
+                # Extract project links and metadata
+                projects = self.extract_project_links(result.html)
+                logger.info(f"Found {len(projects)} projects on page {page}")
+                
+                # Check if we've reached the last page
+                if not projects:
+                    logger.info(f"No more projects found on page {page}")
+                    return []
+                
+                return projects
+                
             except Exception as e:
                 logger.error(f"Error scraping list page {url}: {str(e)}")
                 if attempt < max_retries - 1:
@@ -329,194 +454,178 @@ class YuanjisongScraper(BaseScraper):
         url = project['url']
         logger.info(f"Scraping detail page: {project['title']} ({url})")
         
-        async with AsyncWebCrawler() as crawler:
-            # Get crawler config with proxy
-            config = CrawlerRunConfig(
-                **self.config.get_crawler_config(
-                    wait_for=".consultant_title",
-                    js_code="""
-                        // Scroll through the page to ensure all content is loaded
-                        window.scrollTo(0, document.body.scrollHeight);
-                        await new Promise(r => setTimeout(r, 1000));
-                        window.scrollTo(0, 0);
-                    """
-                )
-            )
-            
-            # Get proxy configuration
-            proxy = self.config.get_proxy()
-            if proxy:
-                logger.info(f"Using proxy: {proxy.get('http')}")
-            else:
-                logger.warning("No proxy available")
-            
-            result = await crawler.arun(url, config=config, proxy=proxy)
-            
-            if not result.success:
-                logger.error(f"Failed to fetch detail page {url}: {result.error_message}")
-                return None
-            
-            if not result.html:
-                logger.warning(f"No HTML content in detail page {url}")
-                return None
-            
-            # Extract detailed project information
-            details = self.extract_project_details(result.html)
-            
-            # Merge with list page metadata
-            merged = {**project, **details}
-            
-            # Ensure we have the most important fields
-            if not merged.get('title') or not merged.get('url'):
-                logger.warning(f"Missing required fields for {url}")
-                return None
-            
-            return merged
+        crawler = await self._ensure_crawler()
+        
+        # Reuse the prebuilt crawler config; the proxy is passed per request
+        config = self.detail_config
+        
+        # Get proxy configuration
+        proxy = self.config.get_proxy()
+        if proxy:
+            logger.info(f"Using proxy: {proxy.get('http')}")
+        else:
+            logger.warning("No proxy available")
+        
+        await self._get_limiter(url).acquire()
+        result = await crawler.arun(url, config=config, proxy=proxy)
+        
+        if not result.success:
+            logger.error(f"Failed to fetch detail page {url}: {result.error_message}")
+            return None
+        
+        if not result.html:
+            logger.warning(f"No HTML content in detail page {url}")
+            return None
+        
+        # Extract detailed project information
+        details = self.extract_project_details(result.html)
+        
+        # Merge with list page metadata
+        merged = {**project, **details}
+        
+        # Ensure we have the most important fields
+        if not merged.get('title') or not merged.get('url'):
+            logger.warning(f"Missing required fields for {url}")
+            return None
+        
+        return merged
 
-    async def scrape_page(self, page: int = 1) -> List[Dict]:
+    async def scrape_page(self, page: int = 1, checkpoint: bool = True) -> List[Dict]:
         """Scrape a single page of job listings.
         
         Args:
             page (int): Page number to scrape
+            checkpoint (bool): Append the page to the NDJSON checkpoint. Callers
+                that may discard the page pass False and save it themselves.
             
         Returns:
             List[Dict]: List of scraped job listings
         """
-        self.logger.info(f"Scraping page {page} from yuanjisong.com")
+        if self._page_sem is None:
+            self._page_sem = asyncio.Semaphore(self.page_concurrency)
         
-        detailed_projects = []
+        async with self._page_sem:
+            self.logger.info(f"Scraping page {page} from yuanjisong.com")
         
-        try:
-            # Initialize crawler for list page
-            async with AsyncWebCrawler() as crawler:
-                # Get crawler config with proxy
-                config = CrawlerRunConfig(
-                    **self.config.get_crawler_config(
-                        wait_for=".div_bg_color_fff",
-                        js_code="""
-                            // Scroll to bottom to trigger any lazy loading
-                            window.scrollTo(0, document.body.scrollHeight);
-                            // Wait a bit for content to load
-                            await new Promise(r => setTimeout(r, 2000));
-                            // Scroll back to top
-                            window.scrollTo(0, 0);
-                        """
-                    )
-                )
-                
+            # Detailed projects keyed by URL, so repeats collapse into one entry
+            detailed: Dict[str, Dict] = {}
+        
+            try:
+                # Reuse the shared crawler for the list page
+                crawler = await self._ensure_crawler()
+            
+                # Reuse the prebuilt crawler config; the proxy is passed per request
+                config = self.list_config
+            
                 # Get proxy configuration
                 proxy = self.config.get_proxy()
                 if proxy:
                     self.logger.info(f"Using proxy: {proxy.get('http')}")
                 else:
                     self.logger.warning("No proxy available")
-                
+            
                 # Scrape list page
                 url = f"https://www.yuanjisong.com/job/allcity/page{page}"
+                await self._get_limiter(url).acquire()
                 result = await crawler.arun(url, config=config, proxy=proxy)
-                
+            
                 if not result or not result.html:
                     self.logger.error(f"Failed to scrape page {page}")
                     return []
-                    
+                
                 # Extract project links and basic info
                 projects = self.extract_project_links(result.html)
                 self.logger.info(f"Found {len(projects)} projects on page {page}")
             
-            # Create tasks for detail page scraping
-            detail_tasks = []
-            for project in projects:
-                task = asyncio.create_task(self._scrape_detail_page(project, proxy))
-                detail_tasks.append(task)
+                # Create tasks for detail page scraping
+                detail_tasks = []
+                for project in projects:
+                    task = asyncio.create_task(self._scrape_detail_page(crawler, project, proxy))
+                    detail_tasks.append(task)
             
-            # Wait for all detail pages to be scraped with timeout
-            try:
-                # Use asyncio.gather to collect all results
-                completed_tasks = await asyncio.wait_for(
-                    asyncio.gather(*detail_tasks, return_exceptions=True),
-                    timeout=len(projects) * 10  # 10 seconds per project
-                )
+                # Wait for all detail pages to be scraped with timeout
+                try:
+                    # Use asyncio.gather to collect all results
+                    completed_tasks = await asyncio.wait_for(
+                        asyncio.gather(*detail_tasks, return_exceptions=True),
+                        timeout=self.detail_batch_timeout
+                    )
                 
-                # Process results
-                for result in completed_tasks:
-                    if isinstance(result, Exception):
-                        self.logger.error(f"Error in detail scraping: {str(result)}")
-                    elif result:
-                        detailed_projects.append(result)
+                    # Process results
+                    for result in completed_tasks:
+                        if isinstance(result, Exception):
+                            self.logger.error(f"Error in detail scraping: {str(result)}")
+                        elif result:
+                            detailed[result['url']] = result
                 
-            except asyncio.TimeoutError:
-                self.logger.error("Timeout waiting for detail pages")
-                # Add basic info for projects that didn't complete
-                for project in projects:
-                    if not any(d.get('url') == project['url'] for d in detailed_projects):
-                        detailed_projects.append(project)
+                except asyncio.TimeoutError:
+                    self.logger.error("Timeout waiting for detail pages")
+                    # Add basic info for projects that didn't complete
+                    for project in projects:
+                        detailed.setdefault(project['url'], project)
                 
-        except Exception as e:
-            self.logger.error(f"Error scraping page {page}: {str(e)}")
-            return []
+            except Exception as e:
+                self.logger.error(f"Error scraping page {page}: {str(e)}")
+                return []
             
-        # Save results for this page
-        self.save_results(detailed_projects)
+            # Save results for this page
+            detailed_projects = list(detailed.values())
+            if checkpoint:
+                self.save_results(detailed_projects)
         
-        return detailed_projects
+            return detailed_projects
 
-    async def _scrape_detail_page(self, project: Dict, proxy: Optional[Dict] = None) -> Optional[Dict]:
+    async def _scrape_detail_page(self, crawler: AsyncWebCrawler, project: Dict,
+                                  proxy: Optional[Dict] = None) -> Optional[Dict]:
         """Scrape a single detail page.
         
         Args:
+            crawler (AsyncWebCrawler): Crawler that fetched the list page
             project (Dict): Project basic info
             proxy (Optional[Dict]): Proxy configuration
             
         Returns:
             Optional[Dict]: Project with details if successful
         """
-        html_content = None  # Store HTML content outside the crawler context
+        if self._detail_sem is None:
+            self._detail_sem = asyncio.Semaphore(self.detail_concurrency)
         
-        try:
-            async with AsyncWebCrawler() as detail_crawler:
-                # Configure crawler for detail page
-                detail_config = CrawlerRunConfig(
-                    **self.config.get_crawler_config(
-                        wait_for="h2",  # Updated selector
-                        js_code="""
-                            // Scroll through the page to ensure all content is loaded
-                            window.scrollTo(0, document.body.scrollHeight);
-                            await new Promise(r => setTimeout(r, 1000));
-                            window.scrollTo(0, 0);
-                            // Wait for content to stabilize
-                            await new Promise(r => setTimeout(r, 500));
-                        """
-                    )
-                )
-                
-                # Add timeout for detail page scraping
+        async with self._detail_sem:
+            html_content = None
+        
+            try:
+                # Reuse the prebuilt detail page config
+                detail_config = self.detail_config_h2
+            
+                # Add timeout for detail page scraping, after waiting for a rate-limit slot
+                await self._get_limiter(project['url']).acquire()
                 detail_result = await asyncio.wait_for(
-                    detail_crawler.arun(project['url'], config=detail_config, proxy=proxy),
+                    crawler.arun(project['url'], config=detail_config, proxy=proxy),
                     timeout=30  # 30 seconds timeout
                 )
-                
+            
                 if detail_result and detail_result.success:
                     html_content = detail_result.html
-                    self.logger.debug(f"Successfully fetched HTML for {project['url']}")
+                    self.logger.opt(lazy=True).debug("Successfully fetched HTML for {}", lambda: project['url'])
                 else:
                     self.logger.warning(f"Failed to fetch detail page: {project['url']}")
                     return project  # Return basic info if fetch fails
             
-            # Process HTML content outside the crawler context
-            if html_content:
-                # Extract details and merge with basic info
-                details = self.extract_project_details(html_content)
-                if details:
-                    project.update(details)
-                    self.logger.debug(f"Added details for project: {project['url']}")
-                    return project
+                # Process HTML content
+                if html_content:
+                    # Extract details and merge with basic info
+                    details = self.extract_project_details(html_content)
+                    if details:
+                        project.update(details)
+                        self.logger.opt(lazy=True).debug("Added details for project: {}", lambda: project['url'])
+                        return project
             
-            self.logger.warning(f"No valid HTML content for: {project['url']}")
-            return project  # Return basic info if content processing fails
+                self.logger.warning(f"No valid HTML content for: {project['url']}")
+                return project  # Return basic info if content processing fails
                 
-        except (asyncio.TimeoutError, Exception) as e:
-            self.logger.error(f"Error scraping detail page {project['url']}: {str(e)}")
-            return project  # Return basic info on error
+            except (asyncio.TimeoutError, Exception) as e:
+                self.logger.error(f"Error scraping detail page {project['url']}: {str(e)}")
+                return project  # Return basic info on error
 
     async def scrape(self, max_pages: int = 5) -> List[Dict]:
         """Scrape job listings from yuanjisong.com using two-stage scraping.
@@ -528,43 +637,59 @@ class YuanjisongScraper(BaseScraper):
         Returns:
             List[Dict]: List of scraped job listings
         """
-        all_jobs = []
+        page_results: List[List[Dict]] = []
         page = 1
+        done = False
         
-        while True:
-            try:
-                # Scrape one page at a time
-                projects = await self.scrape_page(page)
-                if not projects:
-                    logger.warning(f"No projects found on page {page}, stopping pagination")
+        # With a page limit every page is requested at once, otherwise pages
+        # are requested in batches; the semaphore in scrape_page bounds both and
+        # the per-host limiter spaces the individual requests
+        window = max_pages or self.page_concurrency
+        
+        await self._ensure_crawler()
+        while not done:
+            last = page + window - 1
+            if max_pages:
+                last = min(last, max_pages)
+            batch = range(page, last + 1)
+            pages = await asyncio.gather(*[self.scrape_page(p, checkpoint=False) for p in batch],
+                                         return_exceptions=True)
+            
+            # Keep pages in order up to the first empty or failed one
+            for p, projects in zip(batch, pages):
+                if isinstance(projects, BaseException):
+                    logger.error(f"Error scraping list page {p}: {str(projects)}")
+                    done = True
                     break
-                
-                # Add projects to results
-                all_jobs.extend(projects)
-                logger.info(f"Added {len(projects)} projects from page {page}")
-                
-                # Check if we've reached max_pages
-                if max_pages and page >= max_pages:
-                    logger.info(f"Reached max pages limit ({max_pages})")
+                if not projects:
+                    logger.warning(f"No projects found on page {p}, stopping pagination")
+                    done = True
                     break
-                    
-                # Increment page counter
-                page += 1
                 
-                # Add delay between pages
-                await asyncio.sleep(self.config.rate_limit)
-                        
-            except Exception as e:
-                logger.error(f"Error scraping list page {page}: {str(e)}")
-                break
+                # Add projects to results; only kept pages reach the checkpoint
+                page_results.append(projects)
+                self.save_results(projects)
+                logger.info(f"Added {len(projects)} projects from page {p}")
+            
+            # Check if we've reached max_pages
+            if not done and max_pages and last >= max_pages:
+                logger.info(f"Reached max pages limit ({max_pages})")
+                done = True
+            
+            page = last + 1
+        
+        await self._close_crawler()
+        self.flush_results()
+        
+        all_jobs = list(chain.from_iterable(page_results))
         
         # Save final results
         output_file = Path(self.config.output_dir) / f"{self.platform_name}.json"
         logger.info(f"Saving {len(all_jobs)} jobs to {output_file}")
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(all_jobs, f, ensure_ascii=False, indent=2)
+            # Write from a worker thread so in-flight coroutines keep running
+            await asyncio.to_thread(_write_json, output_file, all_jobs, self.config.debug)
             logger.info(f"Successfully saved results to {output_file}")
         except Exception as e:
             logger.error(f"Error saving results to {output_file}: {str(e)}")
@@ -574,7 +699,7 @@ class YuanjisongScraper(BaseScraper):
     async def cleanup(self):
         """Clean up resources used by the scraper."""
         try:
-            # Add any cleanup code here if needed in the future
-            pass
+            self.flush_results()
+            await self._close_crawler()
         except Exception as e:
             self.logger.error(f"Error during cleanup: {str(e)}") 
\ No newline at end of file
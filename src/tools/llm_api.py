@@ -3,42 +3,107 @@ LLM API module for interacting with language models.
 """
 
 import asyncio
-import subprocess
-from typing import Optional
+import os
+from typing import Dict, List
 from loguru import logger
 
+# Providers served in-process, mapped to the model used for them
+_DEFAULT_MODELS = {
+    "openai": os.getenv("OPENAI_MODEL", "gpt-4o"),
+}
+
+# Async SDK clients, created on first use and reused so connections stay alive
+_CLIENTS: Dict[str, object] = {}
+
+
+def _get_client(provider: str):
+    """Get the shared async client for a provider.
+
+    Args:
+        provider (str): The LLM provider
+
+    Returns:
+        The client, or None when the provider has no in-process SDK available
+    """
+    client = _CLIENTS.get(provider)
+    if client is None and provider == "openai":
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            return None
+        client = _CLIENTS[provider] = AsyncOpenAI()
+    return client
+
+
+async def _query_llm_subprocess(prompt: str, provider: str) -> str:
+    """Query the language model through the tools/llm_api.py script.
+
+    Args:
+        prompt (str): The prompt to send to the model
+        provider (str): The LLM provider to use
+
+    Returns:
+        str: The model's response
+    """
+    # Run the LLM API command
+    cmd = ["python", "./tools/llm_api.py", "--prompt", prompt]
+    if provider:
+        cmd.extend(["--provider", provider])
+
+    # Execute command and get output
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    stdout, stderr = await process.communicate()
+
+    if process.returncode != 0:
+        logger.error(f"LLM API error: {stderr.decode()}")
+        return f"Error: Failed to get response from {provider}"
+
+    return stdout.decode().strip()
+
+
 async def query_llm(prompt: str, provider: str = "openai") -> str:
     """Query the language model.
-    
+
+    The provider's SDK is called in-process when it is installed. The
+    tools/llm_api.py subprocess is used otherwise, or when the
+    LLM_VIA_SUBPROCESS environment variable is set.
+
     Args:
         prompt (str): The prompt to send to the model
         provider (str, optional): The LLM provider to use. Defaults to "openai".
-        
+
     Returns:
         str: The model's response
     """
     try:
-        # Run the LLM API command
-        cmd = ["python", "./tools/llm_api.py", "--prompt", prompt]
-        if provider:
-            cmd.extend(["--provider", provider])
-            
-        # Execute command and get output
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+        client = None if os.getenv("LLM_VIA_SUBPROCESS") else _get_client(provider)
+        if client is None:
+            return await _query_llm_subprocess(prompt, provider)
+
+        response = await client.chat.completions.create(
+            model=_DEFAULT_MODELS[provider],
+            messages=[{"role": "user", "content": prompt}]
         )
-        
-        stdout, stderr = await process.communicate()
-        
-        if process.returncode != 0:
-            logger.error(f"LLM API error: {stderr.decode()}")
-            return f"Error: Failed to get response from {provider}"
-            
-        response = stdout.decode().strip()
-        return response
-        
+        return (response.choices[0].message.content or "").strip()
+
     except Exception as e:
         logger.error(f"Error querying LLM: {str(e)}")
-        return "Error: Failed to query language model" 
\ No newline at end of file
+        return "Error: Failed to query language model"
+
+
+async def query_llm_many(prompts: List[str], provider: str = "openai") -> List[str]:
+    """Query the language model with several prompts concurrently.
+
+    Args:
+        prompts (List[str]): The prompts to send to the model
+        provider (str, optional): The LLM provider to use. Defaults to "openai".
+
+    Returns:
+        List[str]: The model's responses, in prompt order
+    """
+    return await asyncio.gather(*[query_llm(prompt, provider) for prompt in prompts])
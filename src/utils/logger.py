@@ -2,9 +2,11 @@
 Logging utility functions.
 """
 
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from src.config import LOG_DIR
 
 def setup_logger(name: str) -> logging.Logger:
@@ -50,8 +52,18 @@ def setup_logger(name: str) -> logging.Logger:
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
     
+    # 文件写入交给后台线程，记录日志时只需入队
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # 退出时写完队列中剩余的记录
+    
     # 添加处理器
-    logger.addHandler(file_handler)
+    logger.addHandler(QueueHandler(log_queue))
     logger.addHandler(console_handler)
+    logger.propagate = False
+    
+    # 保存监听器引用，避免被回收
+    logger.queue_listener = listener
     
     return logger 
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Event loop helper shared by the command-line entry points.
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop  # libuv-based event loop, not available on Windows
+except ImportError:
+    uvloop = None
+
+
+def run(coro: Coroutine) -> Any:
+    """Run a coroutine to completion, on uvloop when it is installed.
+
+    Args:
+        coro (Coroutine): Coroutine to run
+
+    Returns:
+        Any: The coroutine's result
+    """
+    if hasattr(asyncio, "Runner"):
+        # Python 3.11+: choose the loop per runner rather than through the global policy
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop if uvloop else None) as runner:
+            return runner.run(coro)
+
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
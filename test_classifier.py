@@ -2,10 +2,10 @@
 Test script for job classification analysis.
 """
 
-import asyncio
 from loguru import logger
 from src.config.config import Config
 from src.models.job_classifier import JobClassifier
+from src.utils.loop import run
 
 async def test_classification():
     """Test job classification analysis."""
@@ -37,4 +37,4 @@ async def test_classification():
 
 if __name__ == "__main__":
     # Run the test
-    asyncio.run(test_classification()) 
\ No newline at end of file
+    run(test_classification()) 
\ No newline at end of file
@@ -1,6 +1,6 @@
-import asyncio
 from src.config.config import Config
 from src.scrapers.yuanjisong_scraper import YuanjisongScraper
+from src.utils.loop import run
 from loguru import logger
 
 async def test_detail_scraping():
@@ -24,7 +24,8 @@ async def test_detail_scraping():
     
     # Try to scrape the detail page
     try:
-        result = await scraper._scrape_detail_page(test_project, proxy)
+        crawler = await scraper._ensure_crawler()
+        result = await scraper._scrape_detail_page(crawler, test_project, proxy)
         
         if result:
             logger.info("Successfully scraped detail page:")
@@ -45,9 +46,9 @@ async def test_detail_scraping():
 if __name__ == "__main__":
     try:
         # Run the test in the event loop
-        asyncio.run(test_detail_scraping())
+        run(test_detail_scraping())
     except KeyboardInterrupt:
         logger.warning("Test interrupted by user")
     except Exception as e:
         logger.error(f"Test failed with error: {str(e)}")
-    # No need to manually handle event loop cleanup as asyncio.run() does this for us 
\ No newline at end of file
+    # No need to manually handle event loop cleanup as the runner does this for us 
\ No newline at end of file
@@ -2,15 +2,40 @@
 """
 Generic web scraping tool using Crawl4AI.
 """
-import asyncio
-import json
+import functools
+import orjson
 import argparse
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import AsyncIterator, Dict, List, Optional
 from loguru import logger
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode, MemoryAdaptiveDispatcher
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy
+from crawl4ai.deep_crawling.filters import DomainFilter, FilterChain, URLPatternFilter
 from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
 
+# Fix import path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from src.utils.loop import run
+
+def _dumps(obj) -> bytes:
+    """Serialize an object to indented UTF-8 JSON."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+@functools.lru_cache(maxsize=64)
+def _get_strategy(schema_json: bytes) -> JsonCssExtractionStrategy:
+    """Build the extraction strategy for a serialized schema, once per distinct schema."""
+    return JsonCssExtractionStrategy(orjson.loads(schema_json))
+
+def _cache_mode(value: str) -> CacheMode:
+    """Look up a CacheMode by value, falling back to ENABLED for unknown ones."""
+    try:
+        return CacheMode(value)
+    except ValueError:
+        logger.warning(f"Unknown cache_mode {value!r}, using 'enabled'")
+        return CacheMode.ENABLED
+
 class WebScraper:
     """Generic web scraper using Crawl4AI."""
     
@@ -22,24 +47,79 @@ class WebScraper:
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Shared crawlers keyed by whether they drive a browser; None outside `async with`
+        self._crawlers: Optional[Dict[bool, AsyncWebCrawler]] = None
 
-    async def scrape_with_schema(self, url: str, schema: Dict, config: Optional[Dict] = None) -> Dict:
-        """Scrape content using a CSS selector schema.
+    async def __aenter__(self) -> "WebScraper":
+        """Share crawlers across every scrape until exit."""
+        self._crawlers = {}
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Close the shared crawlers."""
+        crawlers, self._crawlers = self._crawlers or {}, None
+        for crawler in crawlers.values():
+            await crawler.__aexit__(exc_type, exc, tb)
+
+    @staticmethod
+    def _new_crawler(browser: bool) -> AsyncWebCrawler:
+        """Create a browser-backed crawler, or a plain HTTP one when no JS has to run."""
+        if browser:
+            return AsyncWebCrawler()
+        return AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy())
+
+    @asynccontextmanager
+    async def _crawler_for(self, config: Optional[Dict] = None) -> AsyncIterator[AsyncWebCrawler]:
+        """Yield a crawler suited to the configuration.
+        
+        Pages only need a browser when the configuration has js_code to run;
+        everything else is fetched over plain HTTP.
+        
+        Args:
+            config (Optional[Dict]): Additional configuration options
+        """
+        browser = bool(config and config.get('js_code'))
+        if self._crawlers is None:
+            # Not entered as a context manager: use a crawler for this call only
+            async with self._new_crawler(browser) as crawler:
+                yield crawler
+            return
+        
+        crawler = self._crawlers.get(browser)
+        if crawler is None:
+            crawler = self._crawlers[browser] = await self._new_crawler(browser).__aenter__()
+        yield crawler
+
+    @staticmethod
+    def _failure(url: str, error: str) -> Dict:
+        """Build the response returned for a URL that could not be scraped."""
+        return {
+            'success': False,
+            'content': None,
+            'error': error,
+            'url': url,
+            'raw_html': None,
+            'status_code': None,
+            'headers': None
+        }
+
+    def _build_run_config(self, schema: Dict, config: Optional[Dict] = None,
+                          stream: bool = False) -> CrawlerRunConfig:
+        """Build the crawler run configuration for a schema.
         
         Args:
-            url (str): URL to scrape
             schema (Dict): CSS selector schema
             config (Optional[Dict]): Additional configuration options
+            stream (bool): Have arun_many yield results as they finish
             
         Returns:
-            Dict: Scraped content and metadata
+            CrawlerRunConfig: Run configuration shared by every URL using the schema
         """
-        logger.debug(f"Scraping {url} with schema: {json.dumps(schema, indent=2)}")
-        
         run_config = CrawlerRunConfig(
             # Core settings
             verbose=True,
-            cache_mode=CacheMode.ENABLED,
+            stream=stream,
+            cache_mode=_cache_mode(config.get('cache_mode', 'enabled')) if config else CacheMode.ENABLED,
             
             # Content settings
             word_count_threshold=config.get('word_count_threshold', 10) if config else 10,
@@ -52,106 +132,164 @@ class WebScraper:
             page_timeout=config.get('page_timeout', 30000) if config else 30000,
             
             # Extraction settings
-            extraction_strategy=JsonCssExtractionStrategy(schema),
+            extraction_strategy=_get_strategy(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)),
             
             # Anti-bot settings
             simulate_user=config.get('simulate_user', True) if config else True,
             magic=config.get('magic', True) if config else True
         )
         
-        logger.debug(f"Using config: {run_config}")
+        logger.opt(lazy=True).debug("Using config: {}", lambda: run_config)
+        return run_config
+
+    def _build_response(self, url: str, result, include_raw_html: bool = False) -> Dict:
+        """Turn a crawl result into the response returned to callers.
         
-        try:
-            async with AsyncWebCrawler() as crawler:
-                result = await crawler.arun(url, config=run_config)
-                logger.debug(f"Got result for {url}: success={result.success}")
+        Args:
+            url (str): URL that was scraped
+            result: Crawl4AI result for the URL
+            include_raw_html (bool): Keep the page HTML in the response
+            
+        Returns:
+            Dict: Scraped content and metadata
+        """
+        logger.debug(f"Got result for {url}: success={result.success}")
+        
+        # Get raw HTML from result when asked for: the original HTML, else the sanitized one
+        raw_html = None
+        if result.success and include_raw_html:
+            raw_html = getattr(result, 'html', None)
+            source = 'html'
+            if raw_html is None:
+                raw_html = getattr(result, 'cleaned_html', None)
+                source = 'cleaned_html'
+            if raw_html is None:
+                logger.warning(f"Could not get HTML from result for {url}")
+            else:
+                logger.debug(f"Got HTML from result.{source} for {url}")
+        
+        # Get extracted content
+        content = None
+        if result.success and result.extracted_content:
+            try:
+                # Log raw extracted content
+                logger.opt(lazy=True).debug("Raw extracted content from {}: {}", lambda: url, lambda: result.extracted_content)
                 
-                # Get raw HTML from result
-                raw_html = None
-                if result.success:
-                    try:
-                        raw_html = result.html  # Original HTML
-                        logger.debug(f"Got HTML from result.html for {url}")
-                    except:
-                        try:
-                            raw_html = result.cleaned_html  # Sanitized HTML
-                            logger.debug(f"Got HTML from result.cleaned_html for {url}")
-                        except:
-                            logger.warning(f"Could not get HTML from result for {url}")
+                # The extracted_content field contains JSON string
+                content = orjson.loads(result.extracted_content)
+                logger.opt(lazy=True).debug("Parsed content from {}: {}", lambda: url, lambda: _dumps(content).decode())
                 
-                # Get extracted content
-                content = None
-                if result.success and result.extracted_content:
-                    try:
-                        # Log raw extracted content
-                        logger.debug(f"Raw extracted content from {url}: {result.extracted_content}")
-                        
-                        # The extracted_content field contains JSON string
-                        content = json.loads(result.extracted_content)
-                        logger.debug(f"Parsed content from {url}: {json.dumps(content, indent=2)}")
-                        
-                        # If it's a list with one item, extract that item
-                        if isinstance(content, list) and len(content) == 1:
-                            content = content[0]
-                            logger.debug(f"Extracted single item from list for {url}")
-                    except json.JSONDecodeError:
-                        # If not JSON, use as is (might be plain text)
-                        content = result.extracted_content
-                        logger.debug(f"Using raw content for {url} (not JSON)")
-                    except Exception as e:
-                        logger.error(f"Error parsing extracted content from {url}: {str(e)}")
-                else:
-                    logger.warning(f"No extracted content for {url}")
+                # If it's a list with one item, extract that item
+                if isinstance(content, list) and len(content) == 1:
+                    content = content[0]
+                    logger.debug(f"Extracted single item from list for {url}")
+            except orjson.JSONDecodeError:
+                # If not JSON, use as is (might be plain text)
+                content = result.extracted_content
+                logger.debug(f"Using raw content for {url} (not JSON)")
+            except Exception as e:
+                logger.error(f"Error parsing extracted content from {url}: {str(e)}")
+        else:
+            logger.warning(f"No extracted content for {url}")
+        
+        response = {
+            'success': result.success,
+            'content': content,
+            'error': result.error_message if not result.success else None,
+            'url': result.url,  # Use final URL in case of redirects
+            'raw_html': raw_html,
+            'status_code': result.status_code,
+            'headers': result.response_headers
+        }
+        logger.opt(lazy=True).debug("Returning response for {}: {}", lambda: url, lambda: _dumps(response).decode())
+        return response
+
+    async def scrape_with_schema(self, url: str, schema: Dict, config: Optional[Dict] = None,
+                                 include_raw_html: bool = False) -> Dict:
+        """Scrape content using a CSS selector schema.
+        
+        Args:
+            url (str): URL to scrape
+            schema (Dict): CSS selector schema
+            config (Optional[Dict]): Additional configuration options
+            include_raw_html (bool): Keep the page HTML in the response
+            
+        Returns:
+            Dict: Scraped content and metadata
+        """
+        logger.opt(lazy=True).debug("Scraping {} with schema: {}", lambda: url, lambda: _dumps(schema).decode())
+        try:
+            run_config = self._build_run_config(schema, config)
+            async with self._crawler_for(config) as crawler:
+                result = await crawler.arun(url, config=run_config)
+            return self._build_response(url, result, include_raw_html)
                 
-                response = {
-                    'success': result.success,
-                    'content': content,
-                    'error': result.error_message if not result.success else None,
-                    'url': result.url,  # Use final URL in case of redirects
-                    'raw_html': raw_html,
-                    'status_code': result.status_code,
-                    'headers': result.response_headers
-                }
-                logger.debug(f"Returning response for {url}: {json.dumps(response, indent=2)}")
-                return response
-                    
         except Exception as e:
             logger.error(f"Error scraping {url}: {str(e)}")
-            return {
-                'success': False,
-                'content': None,
-                'error': str(e),
-                'url': url,
-                'raw_html': None,
-                'status_code': None,
-                'headers': None
-            }
-
-    async def scrape_batch(self, urls: List[str], schema: Dict, config: Optional[Dict] = None) -> List[Dict]:
-        """Scrape multiple URLs using the same schema.
+            return self._failure(url, str(e))
+
+    async def scrape_batch(self, urls: List[str], schema: Dict, output_file: str,
+                           config: Optional[Dict] = None, concurrency: int = 8,
+                           include_raw_html: bool = False,
+                           filter_chain: Optional[FilterChain] = None) -> int:
+        """Scrape multiple URLs using the same schema and stream the results to a file.
+        
+        The URLs go through a single streaming arun_many call. Its memory-adaptive
+        dispatcher holds new sessions back while system memory is above 75%.
+        Each response is appended to a JSON array on disk as soon as it arrives,
+        so only the crawls in flight are held in memory.
         
         Args:
             urls (List[str]): URLs to scrape
             schema (Dict): CSS selector schema
+            output_file (str): Output file name, relative to the output directory
             config (Optional[Dict]): Additional configuration options
+            concurrency (int): Maximum number of URLs scraped at the same time
+            include_raw_html (bool): Keep the page HTML in each response
+            filter_chain (Optional[FilterChain]): URLs it rejects are dropped before crawling
             
         Returns:
-            List[Dict]: List of scraped content and metadata
+            int: Number of responses written
         """
-        tasks = [self.scrape_with_schema(url, schema, config) for url in urls]
-        return await asyncio.gather(*tasks)
-
-    def save_results(self, results: Union[Dict, List], output_file: str):
-        """Save scraped results to a file.
+        if filter_chain is not None:
+            allowed = [url for url in urls if await filter_chain.apply(url)]
+            if len(allowed) < len(urls):
+                logger.info(f"Filtered out {len(urls) - len(allowed)} of {len(urls)} URLs")
+            urls = allowed
         
-        Args:
-            results (Union[Dict, List]): Results to save
-            output_file (str): Output file path
-        """
+        logger.opt(lazy=True).debug("Scraping {} URLs with schema: {}", lambda: len(urls), lambda: _dumps(schema).decode())
+        run_config = self._build_run_config(schema, config, stream=True)
+        dispatcher = MemoryAdaptiveDispatcher(
+            memory_threshold_percent=75.0,
+            max_session_permit=concurrency
+        )
         output_path = self.output_dir / output_file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        logger.info(f"Saved results to {output_path}")
+        pending = dict.fromkeys(urls)
+        written = 0
+        
+        with open(output_path, 'wb') as f:
+            
+            def write(response: Dict):
+                # Buffered write; the file is flushed to disk as the buffer fills
+                nonlocal written
+                f.write((b',\n' if written else b'[\n') + _dumps(response))
+                written += 1
+            
+            try:
+                async with self._crawler_for(config) as crawler:
+                    async for result in await crawler.arun_many(urls, config=run_config, dispatcher=dispatcher):
+                        pending.pop(result.url, None)
+                        write(self._build_response(result.url, result, include_raw_html))
+                        
+            except Exception as e:
+                logger.error(f"Error scraping batch of {len(urls)} URLs: {str(e)}")
+                for url in pending:
+                    write(self._failure(url, str(e)))
+            
+            f.write(b'\n]\n' if written else b'[]\n')
+        
+        logger.info(f"Saved {written} results to {output_path}")
+        return written
 
 async def main():
     """Run the scraper from command line."""
@@ -160,22 +298,33 @@ async def main():
     parser.add_argument("--schema", type=str, required=True, help="Path to JSON schema file")
     parser.add_argument("--config", type=str, help="Path to config JSON file")
     parser.add_argument("--output", type=str, default="results.json", help="Output file name")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of URLs scraped at once")
+    parser.add_argument("--include-raw-html", action="store_true", help="Keep each page's HTML in the results")
+    parser.add_argument("--allow-domain", action="append", default=[], help="Only scrape URLs on this domain (repeatable)")
+    parser.add_argument("--url-pattern", action="append", default=[], help="Only scrape URLs matching this glob (repeatable)")
     args = parser.parse_args()
     
     # Load schema
-    with open(args.schema, 'r', encoding='utf-8') as f:
-        schema = json.load(f)
+    schema = orjson.loads(Path(args.schema).read_bytes())
     
     # Load config if provided
     config = None
     if args.config:
-        with open(args.config, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = orjson.loads(Path(args.config).read_bytes())
+    
+    # Build the URL filter if any allowlist was given
+    filters = []
+    if args.allow_domain:
+        filters.append(DomainFilter(allowed_domains=args.allow_domain))
+    if args.url_pattern:
+        filters.append(URLPatternFilter(patterns=args.url_pattern))
+    filter_chain = FilterChain(filters) if filters else None
     
     # Run scraper
-    scraper = WebScraper()
-    results = await scraper.scrape_batch(args.urls, schema, config)
-    scraper.save_results(results, args.output)
+    async with WebScraper() as scraper:
+        await scraper.scrape_batch(
+            args.urls, schema, args.output, config, args.concurrency, args.include_raw_html, filter_chain
+        )
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
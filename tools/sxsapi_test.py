@@ -7,7 +7,47 @@ import re
 from pathlib import Path
 from typing import List, Dict
 from loguru import logger
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy
+
+# Fix import path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from src.utils.loop import run
+
+# Deletion table for the '>' left behind by markdown link artifacts
+_URL_DEL = str.maketrans('', '', '>')
+
+# Navigation/login links on the list page
+_NAV_RE = re.compile('登录|注册|会员|友链合作')
+
+# List page scan: one pass over the whole markdown, dispatched on the matching
+# alternative. Each alternative may start anywhere on its line, and they are
+# tried in order, so a line yields a title before a duration before a deadline.
+# Navigation lines are consumed whole so nothing on them matches.
+# Format: ##  [ 项目标题 ](https://sxsapi.com/</post/235>) ￥ 预算
+_LIST_UNION = re.compile(
+    rf'^(?:(?P<skip>[^\n]*(?:{_NAV_RE.pattern})[^\n]*)'
+    r'|[^\n]*?(?P<title>##[^\S\n]*\[[^\S\n]*(?P<name>[^\]\n]+)\][^\S\n]*'
+    r'\((?P<url>https?://[^)\n]+/post/\d+[^)\n]*)\)[^\S\n]*￥[^\S\n]*(?P<price>[\d~万千以上以下待商议]+))'
+    r'|[^\n]*?(?P<duration>\*[^\S\n]*(?P<days>\d+天|商议工期))'
+    r'|[^\n]*?(?P<deadline>\*[^\S\n]*竞标截止：(?P<date>\d{4}-\d{2}-\d{2}))'
+    r')',
+    re.MULTILINE,
+)
+
+# Detail page scan: one pass over the markdown, each alternative capturing
+# into the group named after the field it fills. Free-text fields are captured
+# inside a lookahead so the fields sharing their line are still seen by the scan.
+_DETAIL_UNION = re.compile(
+    r'#(?=\s*(?P<title>[^#\n]+?)(?:\s*￥|\n?\Z))'  # 项目标题 ￥
+    r'|￥\s*(?P<price>[\d~万千以上以下待商议]+)'  # ￥ 5千~1万
+    r'|工期[：要求]*：\s*(?P<duration>\d+天|商议工期)'  # 工期：30天 or 工期要求：30天
+    r'|竞标截止：(?P<deadline>\d{4}-\d{2}-\d{2})'  # 竞标截止：2025-03-05
+    r'|技能要求：(?=(?P<skills>[^\n]+))'
+    r'|合作倾向：(?=(?P<cooperation>[^\n]+))'
+)
+_DETAIL_FIELDS = len(_DETAIL_UNION.groupindex)
 
 def clean_url(url: str) -> str:
     """Clean up URL by removing artifacts and normalizing format.
@@ -18,8 +58,10 @@ def clean_url(url: str) -> str:
     Returns:
         str: Cleaned URL
     """
-    # Remove </> artifacts and any text after space
-    url = url.split()[0].replace('</', '').replace('>', '')
+    # Remove any text after space, then </> artifacts when present
+    url = url.split(None, 1)[0]
+    if '<' in url or '>' in url:
+        url = url.replace('</', '').translate(_URL_DEL)
     
     # Remove javascript: links
     if 'javascript:' in url:
@@ -43,36 +85,20 @@ def extract_project_links(markdown: str) -> List[Dict[str, str]]:
     projects = []
     current_project = {}
     
-    for line in markdown.split('\n'):
-        line = line.strip()
-        
-        # Skip empty lines and navigation links
-        if not line or any(x in line.lower() for x in ['登录', '注册', '会员', '友链合作']):
-            continue
-            
-        # Look for project title and link
-        # Format: ##  [ 项目标题 ](https://sxsapi.com/</post/235>) ￥ 预算
-        title_match = re.search(r'##\s*\[\s*([^\]]+)\s*\]\s*\((https?://[^)]+/post/\d+[^)]*)\)\s*￥\s*([\d~万千以上以下待商议]+)', line)
-        if title_match:
+    for match in _LIST_UNION.finditer(markdown):
+        kind = match.lastgroup
+        if kind == 'title':
             if current_project:
                 projects.append(current_project)
             current_project = {
-                'title': title_match.group(1).strip(),
-                'url': clean_url(title_match.group(2)),
-                'price': title_match.group(3).strip()
+                'title': match.group('name').strip(),
+                'url': clean_url(match.group('url')),
+                'price': match.group('price').strip()
             }
-            continue
-            
-        # Look for duration
-        duration_match = re.search(r'\*\s*(\d+天|商议工期)', line)
-        if duration_match and current_project:
-            current_project['duration'] = duration_match.group(1)
-            continue
-            
-        # Look for deadline
-        deadline_match = re.search(r'\*\s*竞标截止：(\d{4}-\d{2}-\d{2})', line)
-        if deadline_match and current_project:
-            current_project['deadline'] = deadline_match.group(1)
+        elif kind == 'duration' and current_project:
+            current_project['duration'] = match.group('days')
+        elif kind == 'deadline' and current_project:
+            current_project['deadline'] = match.group('date')
             
     # Add last project if exists
     if current_project:
@@ -91,28 +117,16 @@ def extract_project_details(markdown: str) -> Dict:
     """
     details = {}
     
-    # Extract title (format: # 项目标题)
-    title_match = re.search(r'#\s*([^#\n]+?)(?:\s*￥|$)', markdown)
-    if title_match:
-        details['title'] = title_match.group(1).strip()
-    
-    # Extract price (format: ￥ 5千~1万)
-    price_match = re.search(r'￥\s*([\d~万千以上以下待商议]+)', markdown)
-    if price_match:
-        details['price'] = price_match.group(1).strip()
-    
-    # Extract duration (format: 工期：30天 or 工期要求：30天)
-    duration_match = re.search(r'工期[：要求]*：\s*(\d+天|商议工期)', markdown)
-    if duration_match:
-        details['duration'] = duration_match.group(1)
-    
-    # Extract deadline (format: 竞标截止：2025-03-05)
-    deadline_match = re.search(r'竞标截止：(\d{4}-\d{2}-\d{2})', markdown)
-    if deadline_match:
-        details['deadline'] = deadline_match.group(1)
+    # Keep the first occurrence of every field, stopping once all are found
+    for match in _DETAIL_UNION.finditer(markdown):
+        field = match.lastgroup
+        if field not in details:
+            details[field] = match.group(field).strip()
+            if len(details) == _DETAIL_FIELDS:
+                break
     
     # Extract description
-    description = ""
+    parts = []
     description_started = False
     for line in markdown.split('\n'):
         line = line.strip()
@@ -127,21 +141,11 @@ def extract_project_details(markdown: str) -> Dict:
             if any(x in line for x in ['附件', '报名列表', '阅读全部', '开发者工作指南']):
                 break
             if line and not line.startswith('#') and not line.startswith('!['):
-                description += line + ' '
+                parts.append(line)
     
-    if description:
-        details['description'] = description.strip()
-        
-    # Extract skills (format: 技能要求：xxx)
-    skills_match = re.search(r'技能要求：([^\n]+)', markdown)
-    if skills_match:
-        details['skills'] = skills_match.group(1).strip()
+    if parts:
+        details['description'] = ' '.join(parts)
         
-    # Extract cooperation preference (format: 合作倾向：xxx)
-    coop_match = re.search(r'合作倾向：([^\n]+)', markdown)
-    if coop_match:
-        details['cooperation'] = coop_match.group(1).strip()
-    
     return details
 
 async def test_sxsapi():
@@ -149,9 +153,11 @@ async def test_sxsapi():
     output_dir = Path("output")
     output_dir.mkdir(exist_ok=True)
     
+    # Both pages are served from Crawl4AI's on-disk cache on repeat runs
     # Configure crawler for list page
     list_config = CrawlerRunConfig(
         verbose=True,
+        cache_mode=CacheMode.ENABLED,
         word_count_threshold=10,
         excluded_tags=["nav", "footer"],
         js_code="document.querySelector('.show-more')?.click();",
@@ -161,18 +167,17 @@ async def test_sxsapi():
         wait_for=".project-list, .project-grid, .job-list"
     )
     
-    # Configure crawler for detail page
+    # Configure crawler for detail page (static HTML, fetched without a browser)
     detail_config = CrawlerRunConfig(
         verbose=True,
+        cache_mode=CacheMode.ENABLED,
         word_count_threshold=10,
         excluded_tags=["nav", "footer"],
-        page_timeout=60000,
-        simulate_user=True,
-        magic=True,
-        wait_for="main, article, .content, .container"  # More general selectors
+        page_timeout=60000
     )
     
-    async with AsyncWebCrawler() as crawler:
+    async with AsyncWebCrawler() as crawler, \
+            AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy()) as http_crawler:
         # Test list page
         logger.info("Testing list page...")
         try:
@@ -195,39 +200,49 @@ async def test_sxsapi():
                             logger.info(f"    Deadline: {project['deadline']}")
                         logger.info("")
                     
-                    # Save markdown for analysis
-                    with open(output_dir / "sxsapi_list.md", "w", encoding="utf-8") as f:
-                        f.write(result.markdown)
-                    logger.info("Saved list page markdown")
-                    
-                    # Save extracted projects
-                    with open(output_dir / "sxsapi_projects.json", "w", encoding="utf-8") as f:
-                        json.dump(projects, f, ensure_ascii=False, indent=2)
-                    logger.info("Saved projects to sxsapi_projects.json")
+                    # Save list markdown and extracted projects while the detail page is fetched
+                    list_saved = asyncio.gather(
+                        asyncio.to_thread(
+                            (output_dir / "sxsapi_list.md").write_text, result.markdown, encoding="utf-8"
+                        ),
+                        asyncio.to_thread(
+                            (output_dir / "sxsapi_projects.json").write_text,
+                            json.dumps(projects, ensure_ascii=False, indent=2), encoding="utf-8"
+                        )
+                    )
                     
-                    # Test first project page
-                    if projects:
-                        logger.info(f"\nTesting project page: {projects[0]['title']}")
-                        detail_result = await crawler.arun(projects[0]['url'], config=detail_config)
-                        
-                        if detail_result.success and detail_result.markdown:
-                            # Extract and display project details
-                            details = extract_project_details(detail_result.markdown)
-                            logger.info("\nProject details:")
-                            for key, value in details.items():
-                                logger.info(f"  {key}: {value}")
-                            
-                            # Save project details
-                            with open(output_dir / "sxsapi_project.json", "w", encoding="utf-8") as f:
-                                json.dump(details, f, ensure_ascii=False, indent=2)
-                            logger.info("\nSaved project details to sxsapi_project.json")
+                    try:
+                        # Test first project page
+                        if projects:
+                            logger.info(f"\nTesting project page: {projects[0]['title']}")
+                            detail_result = await http_crawler.arun(projects[0]['url'], config=detail_config)
                             
-                            # Save project page markdown
-                            with open(output_dir / "sxsapi_project.md", "w", encoding="utf-8") as f:
-                                f.write(detail_result.markdown)
-                            logger.info("Saved project page markdown")
-                        else:
-                            logger.error(f"Failed to fetch project page: {detail_result.error_message if detail_result else 'No response'}")
+                            if detail_result.success and detail_result.markdown:
+                                # Extract and display project details
+                                details = extract_project_details(detail_result.markdown)
+                                logger.info("\nProject details:")
+                                for key, value in details.items():
+                                    logger.info(f"  {key}: {value}")
+                                
+                                # Save project details and page markdown
+                                await asyncio.gather(
+                                    asyncio.to_thread(
+                                        (output_dir / "sxsapi_project.json").write_text,
+                                        json.dumps(details, ensure_ascii=False, indent=2), encoding="utf-8"
+                                    ),
+                                    asyncio.to_thread(
+                                        (output_dir / "sxsapi_project.md").write_text,
+                                        detail_result.markdown, encoding="utf-8"
+                                    )
+                                )
+                                logger.info("\nSaved project details to sxsapi_project.json")
+                                logger.info("Saved project page markdown")
+                            else:
+                                logger.error(f"Failed to fetch project page: {detail_result.error_message if detail_result else 'No response'}")
+                    finally:
+                        await list_saved
+                        logger.info("Saved list page markdown")
+                        logger.info("Saved projects to sxsapi_projects.json")
                 else:
                     logger.warning("No markdown content in list page response")
             else:
@@ -237,4 +252,4 @@ async def test_sxsapi():
             logger.error(f"Error during scraping: {str(e)}", exc_info=True)
 
 if __name__ == "__main__":
-    asyncio.run(test_sxsapi())
\ No newline at end of file
+    run(test_sxsapi())
\ No newline at end of file
@@ -1,10 +1,17 @@
-import asyncio
-from crawl4ai import AsyncWebCrawler
+from pathlib import Path
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+
+# Fix import path
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+from src.utils.loop import run
 
 async def main():
     async with AsyncWebCrawler() as crawler:
-        result = await crawler.arun("https://www.yuanjisong.com/job/allcity/page1")
+        # Serve repeat runs from Crawl4AI's on-disk cache instead of the network
+        config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED)
+        result = await crawler.arun("https://www.yuanjisong.com/job/allcity/page1", config=config)
         print(result.html)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -6,6 +6,7 @@ import os
 import sys
 import asyncio
 from pathlib import Path
+from typing import Dict, List
 from loguru import logger
 
 # Add src to Python path
@@ -14,11 +15,26 @@ sys.path.append(str(Path(__file__).parent.parent))
 from src.config.config import Config
 from src.scrapers.yuanjisong_scraper import YuanjisongScraper
 from src.scrapers.sxsapi_scraper import SxsapiScraper
+from src.utils.loop import run
 
 # Configure logger to show debug messages
 logger.remove()  # Remove default handler
 logger.add(sys.stderr, level="DEBUG")
 
+async def _test_scraper(site: str, scraper) -> List[Dict]:
+    """Scrape the first page of one site, returning no projects on failure."""
+    logger.info(f"Testing {site} scraper...")
+    try:
+        logger.debug(f"Calling scrape_page(1) on {site} scraper")
+        projects = await scraper.scrape_page(1)
+        logger.info(f"Found {len(projects)} projects on {site}")
+        if projects:
+            logger.debug(f"First project from {site}: {projects[0]}")
+        return projects
+    except Exception as e:
+        logger.exception(f"Error testing {site}: {str(e)}")
+        return []
+
 async def main():
     """Run both scrapers and save results."""
     try:
@@ -39,29 +55,11 @@ async def main():
         sxsapi = SxsapiScraper(config)
         logger.info("Initialized scrapers")
         
-        # Test yuanjisong.com
-        logger.info("Testing yuanjisong.com scraper...")
-        try:
-            logger.debug("Calling scrape_page(1) on yuanjisong scraper")
-            projects = await yuanjisong.scrape_page(1)
-            logger.info(f"Found {len(projects)} projects on yuanjisong.com")
-            if projects:
-                logger.debug(f"First project from yuanjisong: {projects[0]}")
-        except Exception as e:
-            logger.exception(f"Error testing yuanjisong.com: {str(e)}")
-            projects = []
-        
-        # Test sxsapi.com
-        logger.info("Testing sxsapi.com scraper...")
-        try:
-            logger.debug("Calling scrape_page(1) on sxsapi scraper")
-            projects2 = await sxsapi.scrape_page(1)
-            logger.info(f"Found {len(projects2)} projects on sxsapi.com")
-            if projects2:
-                logger.debug(f"First project from sxsapi: {projects2[0]}")
-        except Exception as e:
-            logger.exception(f"Error testing sxsapi.com: {str(e)}")
-            projects2 = []
+        # Test both sites concurrently
+        projects, projects2 = await asyncio.gather(
+            _test_scraper("yuanjisong.com", yuanjisong),
+            _test_scraper("sxsapi.com", sxsapi),
+        )
         
         # Print summary
         logger.info("\nTest Summary:")
@@ -82,4 +80,4 @@ async def main():
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    run(main())
@@ -4,16 +4,23 @@ import asyncio
 import argparse
 import sys
 import os
-from typing import List, Optional
-from playwright.async_api import async_playwright
-import html5lib
-from multiprocessing import Pool
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+import lxml.html
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
 import time
+import random
 from urllib.parse import urlparse
 import logging
-import json
+import orjson
+import re
 from pathlib import Path
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from loguru import logger
 import aiohttp
 import aiohttp.client_exceptions
@@ -25,23 +32,244 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Lines of extracted page text that look like leftover code or tracking snippets
+_NOISE_RE = re.compile(r'var |function\(\)|\.js|\.css|google-analytics|disqus|[{}]', re.IGNORECASE)
+
+# Chromium flags for headless scraping in containers
+_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-blink-features=AutomationControlled'
+]
+
+# Resource types the Playwright context never downloads; only the HTML is scraped
+_BLOCKED_RESOURCES = frozenset({'image', 'font', 'media', 'stylesheet'})
+
+# Longest pause honoured from a host's rate-limit headers, in seconds
+_MAX_RATE_LIMIT_DELAY = 60.0
+
+# How long max_concurrent stays halved after a 429, in seconds
+_THROTTLE_SECONDS = 60.0
+
+# Text nodes that may hold a sxsapi price or duration
+_PRICE_HINT_RE = re.compile('[￥元]|价格|预算')
+_DURATION_HINT_RE = re.compile('[天月]|工期|周期')
+
+# Characters a cleaned price or duration must contain to be kept
+_CURRENCY_CHARS = frozenset('￥元千万')
+_DURATION_CHARS = frozenset('天月周')
+
+# clean_text pipeline: collapse whitespace, drop the label prefixes (in this
+# order, each at most once), then keep only the tokens carrying a price
+_WHITESPACE_RE = re.compile(r'\s+')
+_LABEL_PREFIX_RE = re.compile(r'^(?:描述：\s*)?(?:项目预算：\s*)?(?:工期：\s*)?(?:￥\s*)?')
+_PRICE_TOKEN_RE = re.compile(r'\S*[￥元千万]\S*')
+
+def _css_first_below(node: LexborNode, selector: str) -> Optional[LexborNode]:
+    """Find the first descendant matching a CSS selector.
+
+    selectolax matches the node itself as well, so it is skipped here to
+    search below it only, like BeautifulSoup's find().
+    """
+    for match in node.css(selector):
+        if match != node:
+            return match
+    return None
+
+def _css_first_of(node: LexborNode, selectors: Tuple[str, ...]) -> Optional[LexborNode]:
+    """Return the first descendant match of the first selector, in priority order, that matches."""
+    for selector in selectors:
+        match = _css_first_below(node, selector)
+        if match:
+            return match
+    return None
+
+def _first_text(node: LexborNode, pattern: re.Pattern) -> Optional[str]:
+    """Find the first text node below a node that the pattern matches."""
+    for child in node.traverse(include_text=True):
+        if child.tag == '-text':
+            text = child.text_content
+            if text and pattern.search(text):
+                return text
+    return None
+
+async def _block_heavy_resources(route):
+    """Abort requests for resources the scraped HTML does not need."""
+    if route.request.resource_type in _BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+def _rate_limit_delay(headers) -> float:
+    """Work out how long a host asks us to wait from its rate-limit headers.
+
+    Honours Retry-After (seconds or an HTTP date) and, failing that, an
+    exhausted X-RateLimit-Remaining with its X-RateLimit-Reset (seconds or
+    a Unix timestamp).
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        float: Seconds to wait, 0 when the host set no limit
+    """
+    delay = 0.0
+    retry_after = headers.get('Retry-After')
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                pass
+    elif headers.get('X-RateLimit-Remaining') == '0':
+        try:
+            delay = float(headers.get('X-RateLimit-Reset', 0))
+        except ValueError:
+            pass
+        if delay > 1e9:  # Unix timestamp rather than a number of seconds
+            delay -= time.time()
+    return min(max(delay, 0.0), _MAX_RATE_LIMIT_DELAY)
+
+def _backoff_delay(attempt: int) -> float:
+    """Jittered exponential backoff, in seconds, after a failed attempt."""
+    return min(_MAX_RATE_LIMIT_DELAY, 2 ** attempt + random.random())
+
+@dataclass
+class _BrowserInstance:
+    """A pooled Chromium process with the context its pages are opened in."""
+    browser: Browser
+    context: BrowserContext
+    created_at: float = field(default_factory=time.monotonic)
+    pages: int = 0  # Pages handed out over the instance's lifetime
+    busy: int = 0  # Pages currently open
+    retired: bool = False  # No new pages; closed once the open ones finish
+
+class _BrowserPool:
+    """Pool of Chromium instances recycled by usage and age and replaced on crash."""
+
+    def __init__(self, playwright: Playwright, size: int, context_options: Dict[str, Any],
+                 max_pages_per_browser: int = 50, max_age_seconds: float = 300):
+        """Initialize the pool. Browsers are launched lazily, on first use.
+
+        Args:
+            playwright (Playwright): Started Playwright driver
+            size (int): Maximum number of live browsers
+            context_options (Dict[str, Any]): Options for each browser's context
+            max_pages_per_browser (int, optional): Pages served before a browser is recycled. Defaults to 50.
+            max_age_seconds (float, optional): Age after which a browser is recycled. Defaults to 300.
+        """
+        self._playwright = playwright
+        self.size = size
+        self.context_options = context_options
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_age_seconds = max_age_seconds
+        self._instances: List[_BrowserInstance] = []
+        self._lock = asyncio.Lock()
+
+    async def _launch(self) -> _BrowserInstance:
+        """Launch a browser and its context."""
+        browser = await self._playwright.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+        context = await browser.new_context(**self.context_options)
+        await context.route("**/*", _block_heavy_resources)
+        return _BrowserInstance(browser, context)
+
+    async def _discard(self, instance: _BrowserInstance):
+        """Drop an instance from the pool and close its browser."""
+        if instance in self._instances:
+            self._instances.remove(instance)
+        try:
+            await instance.context.close()
+            await instance.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {str(e)}")
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Reserve a page slot on the least busy live browser.
+
+        A new browser is launched while the pool is below its size and every
+        live one is busy. A browser is retired once it reaches its page budget
+        or age, or when it is found disconnected, and closed after its last
+        page is released, so later acquisitions launch a replacement.
+        """
+        async with self._lock:
+            live = []
+            for instance in list(self._instances):
+                if not instance.retired and not instance.browser.is_connected():
+                    logger.warning("Browser disconnected, replacing it")
+                    instance.retired = True
+                if not instance.retired:
+                    live.append(instance)
+                elif not instance.busy:
+                    await self._discard(instance)
+
+            instance = min(live, key=lambda i: i.busy, default=None)
+            if instance is None or (instance.busy and len(live) < self.size):
+                instance = await self._launch()
+                self._instances.append(instance)
+
+            instance.busy += 1
+            instance.pages += 1
+            if (instance.pages >= self.max_pages_per_browser
+                    or time.monotonic() - instance.created_at >= self.max_age_seconds):
+                instance.retired = True
+        try:
+            yield instance
+        finally:
+            instance.busy -= 1
+            if not instance.browser.is_connected():
+                instance.retired = True
+            if instance.retired and not instance.busy:
+                await self._discard(instance)
+
+    async def close(self):
+        """Close every browser in the pool."""
+        for instance in list(self._instances):
+            await self._discard(instance)
+
 class WebScraper:
     """Web scraper that can handle both static and JavaScript-rendered content."""
 
-    def __init__(self, max_concurrent: int = 3, output_dir: str = "output"):
+    # yuanjisong.com selectors, each tried in order until one matches
+    _JOB_LIST_SELECTORS = ('.div_bg_color_fff.div_padding_1.hover1', '.job-item', '.job-listing')
+    _TITLE_SELECTORS = ('.text_type_1.line_clamp_1 b', '.job-title', 'h3')
+    _DESCRIPTION_SELECTORS = ('.margin_bottom_10', '.job-description', '.description')
+    _PRICE_SELECTORS = ('.rixin-text-jobs', '.price', '.job-price')
+    _DURATION_SELECTORS = ('.glyphicon-time', '.duration', '.job-duration')
+
+    def __init__(self, max_concurrent: int = 3, output_dir: str = "output", per_host_limit: int = 2,
+                 browser_pool_size: int = 1, max_pages_per_browser: int = 50, max_browser_age: float = 300):
         """Initialize the scraper.
 
         Args:
             max_concurrent (int, optional): Maximum number of concurrent requests. Defaults to 3.
             output_dir (str, optional): Directory to save output files. Defaults to "output".
+            per_host_limit (int, optional): Maximum number of concurrent requests to one host. Defaults to 2.
+            browser_pool_size (int, optional): Maximum number of Chromium instances. Defaults to 1.
+            max_pages_per_browser (int, optional): Pages served before a browser is recycled. Defaults to 50.
+            max_browser_age (float, optional): Seconds before a browser is recycled. Defaults to 300.
         """
         self.max_concurrent = max_concurrent
+        self.per_host_limit = per_host_limit
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        # Admission counter for in-flight requests; max_concurrent can change at runtime
+        self._cond = asyncio.Condition()
+        self._inflight = 0
+        # Limit to restore once a 429 throttle window ends, None when not throttled
+        self._unthrottled_max: Optional[int] = None
+        self._restore_task: Optional[asyncio.Task] = None
         self.session = None
-        self.browser = None
-        self.context = None
+        self._playwright = None
+        self._browser_pool: Optional[_BrowserPool] = None
+        self.browser_pool_size = browser_pool_size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_browser_age = max_browser_age
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
@@ -49,6 +277,62 @@ class WebScraper:
             'Connection': 'keep-alive',
         }
 
+    @asynccontextmanager
+    async def _request_slot(self):
+        """Hold one of the max_concurrent request slots for the duration of the block."""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._inflight < self.max_concurrent)
+            self._inflight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._inflight -= 1
+                self._cond.notify(1)
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore capping concurrent requests to the host of a URL."""
+        host = urlparse(url).netloc
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(self.per_host_limit)
+        return sem
+
+    async def set_max_concurrent(self, max_concurrent: int):
+        """Change how many requests may run at once.
+
+        Requests already in flight are not interrupted when the limit shrinks;
+        new ones wait until the count drops below it.
+
+        Args:
+            max_concurrent (int): New maximum number of concurrent requests
+        """
+        async with self._cond:
+            grew = max_concurrent > self.max_concurrent
+            self.max_concurrent = max_concurrent
+            if grew:
+                self._cond.notify_all()
+
+    async def _throttle(self):
+        """Halve max_concurrent for a minute after a host answers 429.
+
+        Further 429s while throttled extend the window without halving again.
+        """
+        if self._unthrottled_max is None:
+            self._unthrottled_max = self.max_concurrent
+            await self.set_max_concurrent(max(1, self.max_concurrent // 2))
+            logger.warning(f"Rate limited, max_concurrent lowered to {self.max_concurrent} for {_THROTTLE_SECONDS:.0f}s")
+        if self._restore_task:
+            self._restore_task.cancel()
+        self._restore_task = asyncio.create_task(self._restore_concurrency())
+
+    async def _restore_concurrency(self):
+        """Restore the pre-throttle max_concurrent once the window has passed."""
+        await asyncio.sleep(_THROTTLE_SECONDS)
+        self._restore_task = None
+        limit, self._unthrottled_max = self._unthrottled_max, None
+        await self.set_max_concurrent(limit)
+
     async def __aenter__(self):
         await self.init_session()
         return self
@@ -59,32 +343,51 @@ class WebScraper:
     async def init_session(self):
         """Initialize sessions for both aiohttp and Playwright."""
         if not self.session:
-            self.session = aiohttp.ClientSession(headers=self.headers)
-        
-        if not self.browser:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
+            # Pool keep-alive connections per host and cache DNS lookups between requests
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrent * 4,
+                limit_per_host=self.per_host_limit,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+                enable_cleanup_closed=True
             )
-            self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent=self.headers['User-Agent']
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        
+        if not self._browser_pool:
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+            self._browser_pool = _BrowserPool(
+                self._playwright,
+                size=self.browser_pool_size,
+                context_options={
+                    'viewport': {'width': 1920, 'height': 1080},
+                    'user_agent': self.headers['User-Agent']
+                },
+                max_pages_per_browser=self.max_pages_per_browser,
+                max_age_seconds=self.max_browser_age
             )
 
     async def close(self):
         """Close all sessions."""
+        if self._restore_task:
+            self._restore_task.cancel()
+            self._restore_task = None
+        
         if self.session:
             await self.session.close()
             self.session = None
         
-        if self.context:
-            await self.context.close()
-            self.context = None
+        if self._browser_pool:
+            await self._browser_pool.close()
+            self._browser_pool = None
         
-        if self.browser:
-            await self.browser.close()
-            self.browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
 
     async def scrape_with_playwright(self, url: str) -> str:
         """Scrape JavaScript-rendered content using Playwright.
@@ -95,16 +398,18 @@ class WebScraper:
         Returns:
             str: HTML content
         """
-        if not self.context:
+        if not self._browser_pool:
             await self.init_session()
-        
-        page = await self.context.new_page()
+
+        async with self._browser_pool.acquire() as browser:
+            return await self._render_page(browser.context, url)
+
+    async def _render_page(self, context: BrowserContext, url: str) -> Optional[str]:
+        """Render a URL in a new page of the given context and return its HTML."""
+        page = await context.new_page()
         try:
-            # Set longer timeout and wait for network idle
-            await page.goto(url, wait_until='networkidle', timeout=60000)
-            
-            # Wait for potential dynamic content
-            await page.wait_for_timeout(5000)  # Wait 5 seconds
+            # Don't wait for network idle; the listing selector below signals readiness
+            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
             
             # Try to find job listings with JavaScript
             try:
@@ -128,6 +433,15 @@ class WebScraper:
         finally:
             await page.close()
 
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse) -> Union[str, bytes]:
+        """Read a response body, leaving UTF-8 as bytes for the parser to decode."""
+        raw = await response.read()
+        charset = response.charset
+        if charset and charset.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return raw.decode(charset, errors='replace')
+        return raw
+
     async def scrape_page(self, url: str, retry_count: int = 3) -> dict:
         """Scrape a page, using Playwright for sxsapi.com and aiohttp for others.
 
@@ -136,89 +450,87 @@ class WebScraper:
             retry_count (int, optional): Number of retries. Defaults to 3.
 
         Returns:
-            dict: Dictionary containing URL and content
+            dict: Dictionary containing URL and content (raw bytes for UTF-8 aiohttp responses)
         """
         for attempt in range(retry_count):
             try:
-                async with self.semaphore:
-                    if 'sxsapi.com' in url:
-                        content = await self.scrape_with_playwright(url)
-                    else:
-                        if not self.session:
-                            await self.init_session()
-                        
-                        async with self.session.get(url, timeout=30) as response:
-                            if response.status != 200:
-                                logger.error(f"Error fetching {url}: {response.status}")
-                                if attempt < retry_count - 1:
-                                    await asyncio.sleep(2 * (attempt + 1))
-                                    continue
-                                return None
+                # Wait for the host's own slot first so a slow host does not hold global slots
+                async with self._host_semaphore(url):
+                    # The global slot covers only the fetch itself
+                    delay = 0.0
+                    async with self._request_slot():
+                        if 'sxsapi.com' in url:
+                            content = await self.scrape_with_playwright(url)
+                            status = 200
+                        else:
+                            if not self.session:
+                                await self.init_session()
                             
-                            content = await response.text()
+                            async with self.session.get(url) as response:
+                                status = response.status
+                                delay = _rate_limit_delay(response.headers)
+                                content = await self._read_body(response) if status == 200 else None
                     
-                    logger.debug(f"Received content from {url} (first 1000 chars):\n{content[:1000]}")
-                    return {
-                        'url': url,
-                        'content': content
-                    }
+                    if delay:
+                        # Hold only this host's slot until its rate-limit window reopens
+                        logger.debug(f"Rate limited by {urlparse(url).netloc}, waiting {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                    
+                    if status == 200:
+                        logger.debug(f"Received content from {url} (first 1000 chars):\n{content[:1000]}")
+                        return {
+                            'url': url,
+                            'content': content
+                        }
+                
+                logger.error(f"Error fetching {url}: {status}")
+                if status == 429:
+                    await self._throttle()
+                if attempt == retry_count - 1:
+                    return None
+                # Back off without holding any slot; a host-requested delay was already waited out
+                if not delay:
+                    await asyncio.sleep(_backoff_delay(attempt))
             except Exception as e:
                 logger.error(f"Error scraping {url}: {str(e)}")
                 if attempt < retry_count - 1:
-                    await asyncio.sleep(2 * (attempt + 1))
+                    await asyncio.sleep(_backoff_delay(attempt))
                     continue
         return None
 
-    def parse_yuanjisong(self, content: str) -> list:
+    def parse_yuanjisong(self, content: Union[str, bytes]) -> list:
         """Parse yuanjisong.com job listings.
 
         Args:
-            content (str): HTML content
+            content (Union[str, bytes]): HTML content
 
         Returns:
             list: List of job dictionaries
         """
-        soup = BeautifulSoup(content, 'html.parser')
+        tree = LexborHTMLParser(content)
         jobs = []
         
         # Try different selectors for job listings
-        job_divs = soup.select('.div_bg_color_fff.div_padding_1.hover1') or \
-                  soup.select('.job-item') or \
-                  soup.select('.job-listing')
+        job_divs = []
+        for selector in self._JOB_LIST_SELECTORS:
+            job_divs = tree.css(selector)
+            if job_divs:
+                break
                   
         for div in job_divs:
             try:
                 # Try multiple selectors for each field
-                title = (
-                    div.select_one('.text_type_1.line_clamp_1 b') or
-                    div.select_one('.job-title') or
-                    div.select_one('h3')
-                )
-                
-                description = (
-                    div.select_one('.margin_bottom_10') or
-                    div.select_one('.job-description') or
-                    div.select_one('.description')
-                )
-                
-                price = (
-                    div.select_one('.rixin-text-jobs') or
-                    div.select_one('.price') or
-                    div.select_one('.job-price')
-                )
-                
-                duration = (
-                    div.select_one('.glyphicon-time') or
-                    div.select_one('.duration') or
-                    div.select_one('.job-duration')
-                )
+                title = _css_first_of(div, self._TITLE_SELECTORS)
+                description = _css_first_of(div, self._DESCRIPTION_SELECTORS)
+                price = _css_first_of(div, self._PRICE_SELECTORS)
+                duration = _css_first_of(div, self._DURATION_SELECTORS)
                 
                 if title:
                     job = {
-                        'title': title.text.strip(),
-                        'description': description.text.strip() if description else None,
-                        'price': price.text.strip() if price else None,
-                        'duration': duration.parent.text.strip() if duration else None
+                        'title': title.text().strip(),
+                        'description': description.text().strip() if description else None,
+                        'price': price.text().strip() if price else None,
+                        'duration': duration.parent.text().strip() if duration else None
                     }
                     jobs.append(job)
             except Exception as e:
@@ -239,31 +551,21 @@ class WebScraper:
         if not text:
             return None
             
-        # Remove extra whitespace and newlines
-        text = ' '.join(text.split())
-        
-        # Remove unwanted prefixes
-        prefixes_to_remove = ['描述：', '项目预算：', '工期：', '￥']
-        for prefix in prefixes_to_remove:
-            if text.startswith(prefix):
-                text = text[len(prefix):].strip()
+        # Remove extra whitespace and newlines, then unwanted prefixes
+        text = _LABEL_PREFIX_RE.sub('', _WHITESPACE_RE.sub(' ', text).strip())
         
         # Clean up price text
         if '￥' in text or '元' in text:
             # Extract only the price part
-            price_parts = []
-            for part in text.split():
-                if any(c in part for c in ['￥', '元', '千', '万']):
-                    price_parts.append(part)
-            text = ' '.join(price_parts)
+            text = ' '.join(_PRICE_TOKEN_RE.findall(text))
         
         return text.strip() or None
 
-    def parse_sxsapi(self, content: str) -> list:
+    def parse_sxsapi(self, content: Union[str, bytes]) -> list:
         """Parse sxsapi.com job listings.
 
         Args:
-            content (str): HTML content
+            content (Union[str, bytes]): HTML content
 
         Returns:
             list: List of job dictionaries
@@ -271,21 +573,22 @@ class WebScraper:
         if not content:
             return []
             
-        soup = BeautifulSoup(content, 'html.parser')
+        tree = LexborHTMLParser(content)
         jobs = []
+        seen_titles = set()  # To avoid duplicates
         
         logger.debug("Parsing sxsapi.com content")
         
         # Find all project containers
-        project_containers = soup.find_all(class_=lambda x: x and any(word in str(x).lower() for word in ['project', 'job', 'post']))
+        project_containers = tree.css('[class*=project i], [class*=job i], [class*=post i]')
         
         for container in project_containers:
             try:
                 # Look for title in headings or strong tags
                 title = None
-                title_elem = container.find(['h1', 'h2', 'h3', 'h4', 'strong'])
+                title_elem = _css_first_below(container, 'h1, h2, h3, h4, strong')
                 if title_elem:
-                    title = self.clean_text(title_elem.text)
+                    title = self.clean_text(title_elem.text())
                 
                 if not title:
                     continue
@@ -296,24 +599,28 @@ class WebScraper:
                 
                 # Look for description
                 description = None
-                desc_elem = container.find(['p', 'div'], class_=lambda x: x and any(word in str(x).lower() for word in ['desc', 'detail', 'content']))
+                desc_elem = _css_first_below(
+                    container,
+                    'p[class*=desc i], p[class*=detail i], p[class*=content i], '
+                    'div[class*=desc i], div[class*=detail i], div[class*=content i]'
+                )
                 if desc_elem:
-                    description = self.clean_text(desc_elem.text)
+                    description = self.clean_text(desc_elem.text())
                 
                 # Look for price
                 price = None
-                price_elem = container.find(string=lambda x: x and any(word in str(x) for word in ['￥', '元', '价格', '预算']))
+                price_elem = _first_text(container, _PRICE_HINT_RE)
                 if price_elem:
                     price = self.clean_text(price_elem.strip())
-                    if price and not any(word in price for word in ['￥', '元', '千', '万']):
+                    if price and _CURRENCY_CHARS.isdisjoint(price):
                         price = None
                 
                 # Look for duration
                 duration = None
-                duration_elem = container.find(string=lambda x: x and any(word in str(x) for word in ['工期', '周期', '天', '月']))
+                duration_elem = _first_text(container, _DURATION_HINT_RE)
                 if duration_elem:
                     duration = self.clean_text(duration_elem.strip())
-                    if duration and not any(word in duration for word in ['天', '月', '周']):
+                    if duration and _DURATION_CHARS.isdisjoint(duration):
                         duration = None
                 
                 # Only add if we have meaningful data
@@ -326,7 +633,8 @@ class WebScraper:
                     }
                     
                     # Check if this is a duplicate
-                    if not any(j['title'] == job['title'] for j in jobs):
+                    if title not in seen_titles:
+                        seen_titles.add(title)
                         jobs.append(job)
                         logger.debug(f"Found job: {job}")
             
@@ -337,6 +645,85 @@ class WebScraper:
         logger.info(f"Found {len(jobs)} jobs on sxsapi.com")
         return jobs
 
+    def _parse_result(self, result: dict) -> list:
+        """Parse a scrape_page result with the parser for its site."""
+        try:
+            if 'yuanjisong.com' in result['url']:
+                return self.parse_yuanjisong(result['content'])
+            elif 'sxsapi.com' in result['url']:
+                return self.parse_sxsapi(result['content'])
+        except Exception as e:
+            logger.error(f"Error parsing content from {result['url']}: {str(e)}")
+        return []
+
+    async def _iter_results(self, urls: list) -> AsyncIterator[Tuple[int, list]]:
+        """Scrape and parse URLs with a fixed set of workers.
+
+        Workers pull URLs from a bounded queue and parse each page as soon as
+        it arrives, so memory grows with the concurrency limit rather than
+        with the number of URLs.
+
+        Args:
+            urls (list): List of URLs to scrape
+
+        Yields:
+            Tuple[int, list]: Index of the URL and its parsed jobs, as pages complete
+        """
+        todo = asyncio.Queue(maxsize=self.max_concurrent * 4)
+        done = asyncio.Queue(maxsize=self.max_concurrent * 4)
+        worker_count = min(self.max_concurrent, len(urls))
+        
+        async def feed():
+            for item in enumerate(urls):
+                await todo.put(item)
+            for _ in range(worker_count):
+                await todo.put(None)
+        
+        async def worker():
+            while (item := await todo.get()) is not None:
+                index, url = item
+                jobs = []
+                try:
+                    result = await self.scrape_page(url)
+                    if result:
+                        jobs = self._parse_result(result)
+                except Exception as e:
+                    logger.error(f"Error scraping {url}: {str(e)}")
+                await done.put((index, jobs))
+            await done.put(None)
+        
+        tasks = [asyncio.create_task(feed())] + [asyncio.create_task(worker()) for _ in range(worker_count)]
+        try:
+            remaining = worker_count
+            while remaining:
+                item = await done.get()
+                if item is None:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def iter_jobs(self, urls: list) -> AsyncIterator[dict]:
+        """Scrape multiple URLs, yielding job listings as each page is parsed.
+
+        Args:
+            urls (list): List of URLs to scrape
+
+        Yields:
+            dict: Parsed job listing, in page completion order
+        """
+        results = self._iter_results(urls)
+        try:
+            async for _, jobs in results:
+                for job in jobs:
+                    yield job
+        finally:
+            # Stop the workers now if the caller stops iterating early
+            await results.aclose()
+
     async def scrape_urls(self, urls: list) -> list:
         """Scrape multiple URLs and parse their content.
 
@@ -344,26 +731,15 @@ class WebScraper:
             urls (list): List of URLs to scrape
 
         Returns:
-            list: List of parsed job listings
+            list: List of parsed job listings, in URL order
         """
-        tasks = [self.scrape_page(url) for url in urls]
-        results = await asyncio.gather(*tasks)
+        parsed = {}  # URL index -> jobs, so output keeps the input order
+        async for index, jobs in self._iter_results(urls):
+            parsed[index] = jobs
         
-        # Filter out None results and parse the content
         parsed_results = []
-        for result in results:
-            if result:
-                try:
-                    if 'yuanjisong.com' in result['url']:
-                        jobs = self.parse_yuanjisong(result['content'])
-                        parsed_results.extend(jobs)
-                    elif 'sxsapi.com' in result['url']:
-                        jobs = self.parse_sxsapi(result['content'])
-                        parsed_results.extend(jobs)
-                except Exception as e:
-                    logger.error(f"Error parsing content from {result['url']}: {str(e)}")
-                    continue
-                    
+        for index in sorted(parsed):
+            parsed_results.extend(parsed[index])
         return parsed_results
 
 def parse_html(html_content: Optional[str]) -> str:
@@ -372,117 +748,95 @@ def parse_html(html_content: Optional[str]) -> str:
         return ""
     
     try:
-        document = html5lib.parse(html_content)
+        document = lxml.html.document_fromstring(html_content)
         result = []
         seen_texts = set()  # To avoid duplicates
         
         def should_skip_element(elem) -> bool:
             """Check if the element should be skipped."""
-            # Skip script and style tags
-            if elem.tag in ['{http://www.w3.org/1999/xhtml}script', 
-                          '{http://www.w3.org/1999/xhtml}style']:
+            # Skip script and style tags (iterwalk does not visit comments)
+            if elem.tag in ('script', 'style'):
                 return True
             # Skip empty elements or elements with only whitespace
             if not any(text.strip() for text in elem.itertext()):
                 return True
             return False
         
-        def process_element(elem, depth=0):
-            """Process an element and its children recursively."""
-            if should_skip_element(elem):
-                return
-            
-            # Handle text content
-            if hasattr(elem, 'text') and elem.text:
-                text = elem.text.strip()
-                if text and text not in seen_texts:
-                    # Check if this is an anchor tag
-                    if elem.tag == '{http://www.w3.org/1999/xhtml}a':
-                        href = None
-                        for attr, value in elem.items():
-                            if attr.endswith('href'):
-                                href = value
-                                break
-                        if href and not href.startswith(('#', 'javascript:')):
-                            # Format as markdown link
-                            link_text = f"[{text}]({href})"
-                            result.append("  " * depth + link_text)
+        def add_text(text: str, depth: int):
+            """Record a piece of text unless it was seen before."""
+            text = text.strip()
+            if text and text not in seen_texts:
+                result.append("  " * depth + text)
+                seen_texts.add(text)
+        
+        # Start processing from the body tag, falling back to the entire document.
+        # Each element's text is emitted on entry, before its children, and its tail on exit.
+        body = document.find('body')
+        walker = etree.iterwalk(body if body is not None else document, events=('start', 'end'))
+        depth = -1
+        skipped = None
+        for event, elem in walker:
+            if event == 'start':
+                depth += 1
+                if should_skip_element(elem):
+                    # Its end event still follows, but neither children nor tail are emitted
+                    walker.skip_subtree()
+                    skipped = elem
+                    continue
+                
+                # Handle text content
+                if elem.text:
+                    if elem.tag == 'a':
+                        # Format anchors as markdown links
+                        text = elem.text.strip()
+                        href = elem.get('href')
+                        if text and text not in seen_texts and href and not href.startswith(('#', 'javascript:')):
+                            result.append("  " * depth + f"[{text}]({href})")
                             seen_texts.add(text)
                     else:
-                        result.append("  " * depth + text)
-                        seen_texts.add(text)
-            
-            # Process children
-            for child in elem:
-                process_element(child, depth + 1)
-            
-            # Handle tail text
-            if hasattr(elem, 'tail') and elem.tail:
-                tail = elem.tail.strip()
-                if tail and tail not in seen_texts:
-                    result.append("  " * depth + tail)
-                    seen_texts.add(tail)
-        
-        # Start processing from the body tag
-        body = document.find('.//{http://www.w3.org/1999/xhtml}body')
-        if body is not None:
-            process_element(body)
-        else:
-            # Fallback to processing the entire document
-            process_element(document)
+                        add_text(elem.text, depth)
+            else:
+                # Handle tail text
+                if elem is not skipped and elem.tail:
+                    add_text(elem.tail, depth)
+                depth -= 1
         
-        # Filter out common unwanted patterns
-        filtered_result = []
-        for line in result:
-            # Skip lines that are likely to be noise
-            if any(pattern in line.lower() for pattern in [
-                'var ', 
-                'function()', 
-                '.js',
-                '.css',
-                'google-analytics',
-                'disqus',
-                '{',
-                '}'
-            ]):
-                continue
-            filtered_result.append(line)
-        
-        return '\n'.join(filtered_result)
+        # Filter out lines that are likely to be noise
+        return '\n'.join(line for line in result if not _NOISE_RE.search(line))
     except Exception as e:
         logger.error(f"Error parsing HTML: {str(e)}")
         return ""
 
-async def process_urls(urls: List[str], max_concurrent: int = 5) -> List[str]:
-    """Process multiple URLs concurrently."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        try:
-            # Create browser contexts
-            n_contexts = min(len(urls), max_concurrent)
-            contexts = [await browser.new_context() for _ in range(n_contexts)]
-            
-            # Create tasks for each URL
-            tasks = []
-            for i, url in enumerate(urls):
-                context = contexts[i % len(contexts)]
-                task = fetch_page(url, context)
-                tasks.append(task)
-            
-            # Gather results
-            html_contents = await asyncio.gather(*tasks)
-            
-            # Parse HTML contents in parallel
-            with Pool() as pool:
-                results = pool.map(parse_html, html_contents)
-                
-            return results
-            
-        finally:
-            # Cleanup
-            for context in contexts:
-                await context.close()
-            await browser.close()
+async def process_urls(urls: List[str], max_concurrent: int = 5,
+                       scraper: Optional[WebScraper] = None) -> List[str]:
+    """Process multiple URLs concurrently.
+
+    Every URL gets its own page in the scraper's long-lived browser context,
+    so no browser is launched per call. A temporary scraper is started when
+    none is passed in.
+    """
+    if scraper is None:
+        async with WebScraper(max_concurrent=max_concurrent) as scraper:
+            return await process_urls(urls, max_concurrent, scraper)
+    
+    sem = asyncio.Semaphore(max_concurrent)
+    
+    async def fetch(url: str) -> Optional[str]:
+        async with sem:
+            return await scraper.scrape_with_playwright(url)
+    
+    # Gather results
+    html_contents = await asyncio.gather(*(fetch(url) for url in urls))
+    
+    # Parse HTML contents in threads: libxml2 releases the GIL while parsing,
+    # and nothing has to be pickled across processes
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, parse_html, html) for html in html_contents)
+        )
+        
+    return list(results)
 
 def validate_url(url: str) -> bool:
     """Validate if the given string is a valid URL."""
@@ -502,13 +856,14 @@ async def main_async(args):
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     async with WebScraper(max_concurrent=args.max_concurrent) as scraper:
-        results = await scraper.scrape_urls(args.urls)
-        
-        # Save results to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        # Stream jobs to a JSON Lines file as pages are parsed
+        count = 0
+        with open(output_path, 'wb') as f:
+            async for job in scraper.iter_jobs(args.urls):
+                f.write(orjson.dumps(job) + b'\n')
+                count += 1
             
-        logger.info(f"Successfully scraped {len(results)} jobs")
+        logger.info(f"Successfully scraped {count} jobs")
         logger.info(f"Results saved to {output_path}")
 
 def main():
@@ -517,8 +872,8 @@ def main():
     parser.add_argument("urls", nargs="+", help="URLs to scrape")
     parser.add_argument("--max-concurrent", type=int, default=3,
                       help="Maximum number of concurrent requests")
-    parser.add_argument("--output", type=str, default="output/results.json",
-                      help="Output file path")
+    parser.add_argument("--output", type=str, default="output/results.jsonl",
+                      help="Output file path (JSON Lines, one job per line)")
     parser.add_argument("--debug", action="store_true",
                       help="Enable debug logging")
     args = parser.parse_args()